@@ -1,20 +1,17 @@
 """CLI related functions."""
 
+import sys
+
 from click import group, option, Path
 from getpass import getpass
-from peewee import DoesNotExist
+from peewee import DoesNotExist, JOIN
+from zipfile import ZIP_DEFLATED, ZIP_STORED
 
 from config import DB_PATH, HELP
-from db import Archive
-from encryption.decrypt import db_restore_wrapper, decrypt_archive
-from encryption.encrypt import db_backup_wrapper, encrypt_wrapper
-from encryption.keys import (
-    generate_asymmetric_key_pair,
-    import_key_pair,
-    write_all_key_pairs,
-    write_key_pair,
-)
-from utils.helpers import cleanup, get_key_pairs
+from db import Archive, KeyPair, Password
+
+# Modules that load cryptography or Kivy are imported by the commands that use
+# them, so the CLI starts quickly for commands that do not need them.
 
 
 @group()
@@ -28,6 +25,9 @@ def main():
 @option("-k", "--key_pair_name", type=str, required=True, help=HELP["kp"])
 def db_backup(destination, key_pair_name):
     """Creates an encrypted backup of the database."""
+    from encryption.encrypt import db_backup_wrapper
+    from utils.helpers import cleanup
+
     try:
         db_backup_wrapper(destination, key_pair_name)
         cleanup(destination)
@@ -40,6 +40,9 @@ def db_backup(destination, key_pair_name):
 @option("-s", "--source", type=str, required=True, help=HELP["src_file"])
 def db_restore(source):
     """Restores the database from a backup."""
+    from encryption.decrypt import db_restore_wrapper
+    from utils.helpers import cleanup
+
     password = getpass()
     try:
         db_restore_wrapper(source, password)
@@ -56,6 +59,9 @@ def db_restore(source):
 @option("-p", "--password", is_flag=True, help=HELP["pw"])
 def decrypt(source, destination, key_pair_name, password):
     """Decrypts an archive."""
+    from encryption.decrypt import decrypt_archive
+    from utils.helpers import cleanup
+
     pw = ""
     if password:
         pw = getpass()
@@ -71,10 +77,15 @@ def decrypt(source, destination, key_pair_name, password):
 @option("-s", "--source", type=str, required=True, help=HELP["src"])
 @option("-d", "--destination", type=Path(), required=True, help=HELP["dst"])
 @option("-k", "--key_pair_name", type=str, required=True, help=HELP["kp"])
-def encrypt(source, destination, key_pair_name):
+@option("-n", "--no_compression", is_flag=True, help=HELP["store"])
+def encrypt(source, destination, key_pair_name, no_compression):
     """Encrypts a file or directory."""
+    from encryption.encrypt import encrypt_wrapper
+    from utils.helpers import cleanup
+
+    compression = ZIP_STORED if no_compression else ZIP_DEFLATED
     try:
-        encrypt_wrapper(source, destination, key_pair_name)
+        encrypt_wrapper(source, destination, key_pair_name, compression)
         cleanup(destination)
     except Exception as e:
         print(f"Error: {e}")
@@ -85,6 +96,8 @@ def encrypt(source, destination, key_pair_name):
 @option("-d", "--destination", type=Path(), required=True, help=HELP["dst"])
 def export_all_keys(destination):
     """Exports all key pairs."""
+    from encryption.keys import write_all_key_pairs
+
     write_all_key_pairs(destination)
 
 
@@ -93,6 +106,8 @@ def export_all_keys(destination):
 @option("-d", "--destination", type=Path(), required=True, help=HELP["dst"])
 def export_key(key_pair_name, destination):
     """Exports a specific key pair."""
+    from encryption.keys import write_key_pair
+
     write_key_pair(key_pair_name, destination)
 
 
@@ -102,6 +117,8 @@ def export_key(key_pair_name, destination):
 @option("-p", "--password", is_flag=True, help=HELP["pw"])
 def generate(key_pair_name, hint, password):
     """Generates a new asymmetric key pair set."""
+    from encryption.keys import generate_asymmetric_key_pair
+
     pw = ""
     if password:
         pw = getpass()
@@ -120,6 +137,8 @@ def generate(key_pair_name, hint, password):
 @option("-pw", "--password", is_flag=True, help=HELP["pw"])
 def import_key(key_pair_name, private_key, public_key, hint, password):
     """Imports a specific key pair."""
+    from encryption.keys import import_key_pair
+
     pw = ""
     if password:
         pw = getpass()
@@ -130,8 +149,12 @@ def import_key(key_pair_name, private_key, public_key, hint, password):
 def show_all_archives():
     """Displays meta data for all archives."""
 
-    archives = Archive.select()
-    template = "{: <32} {: <64} {: <64} {: <32} {: <32}"
+    # Fetch the key pair names in the same query rather than once per row
+    archives = (
+        Archive.select(Archive, KeyPair)
+        .join(KeyPair)
+        .order_by(Archive.timestamp)
+    )
     header = [
         "Name",
         "Source Path",
@@ -139,17 +162,18 @@ def show_all_archives():
         "Key Pair Name",
         "Timestamp",
     ]
-
-    print(template.format(*header))
-    for archive in archives:
-        row = [
+    rows = [
+        [
             archive.name[:32],
             archive.src_path[:64],
             archive.dst_path[:64],
             archive.key_pair.name,
             str(archive.timestamp),
         ]
-        print(template.format(*row))
+        for archive in archives
+    ]
+
+    print_table([32, 64, 64, 32, 32], header, rows)
 
 
 @main.command()
@@ -158,7 +182,13 @@ def show_archive(archive_name):
     """Displays meta data for a specific archive."""
 
     try:
-        archive = Archive.get(Archive.name == archive_name)
+        archive = (
+            Archive.select(Archive, KeyPair, Password)
+            .join(KeyPair)
+            .join(Password, JOIN.LEFT_OUTER)
+            .where(Archive.name == archive_name)
+            .get()
+        )
     except DoesNotExist:
         print(f"Archive does not exist : {archive_name}")
         return
@@ -185,12 +215,21 @@ def show_archive(archive_name):
     print(f"Timestamp        : {archive.timestamp}")
 
 
+@main.command()
+def show_crypto():
+    """Displays the OpenSSL version and whether AES-NI is disabled."""
+    from encryption.encrypt import check_aes_ni, openssl_version
+
+    aes_ni = "Not disabled" if check_aes_ni().success else "Disabled"
+    print(f"OpenSSL : {openssl_version()}")
+    print(f"AES-NI  : {aes_ni}")
+
+
 @main.command()
 def show_keys():
     """Displays meta data for all key pairs."""
+    from utils.helpers import get_key_pairs
 
-    key_pairs = get_key_pairs()
-    template = "{: <32} {: <10} {: <64} {: <16} {: <32}"
     header = [
         "Name",
         "Password",
@@ -198,14 +237,30 @@ def show_keys():
         "Strong Password",
         "Timestamp",
     ]
-
-    print(template.format(*header))
-    for key_pair in key_pairs:
-        key_pair_list = [
+    rows = [
+        [
             key_pair["name"],
             key_pair["pw"],
             key_pair["hint"],
             key_pair["strong"],
             key_pair["timestamp"],
         ]
-        print(template.format(*key_pair_list))
+        for key_pair in get_key_pairs()
+    ]
+
+    print_table([32, 10, 64, 16, 32], header, rows)
+
+
+def print_table(widths, header, rows):
+    """Prints left aligned columns of text using a single write to stdout.
+
+    Args:
+        widths (list[int]): The minimum width of each column.
+        header (list[str]): The column names.
+        rows (list[list[str]]): The values of each row.
+    """
+    lines = [
+        " ".join(value.ljust(width) for value, width in zip(row, widths))
+        for row in [header] + rows
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -4,7 +4,6 @@ import os
 
 from peewee import SqliteDatabase
 
-
 #: Valid special characters for passwords
 SPECIAL_CHARS = " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
 
@@ -12,13 +11,80 @@ SPECIAL_CHARS = " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
 DB_FILE = "crc_encrypt.db"
 DB_PATH = os.path.dirname(os.path.abspath(__file__))
 DB_FILE_PATH = os.path.join(DB_PATH, DB_FILE)
-DB = SqliteDatabase(None)
+DB_RESTORE_FILE_PATH = f"{DB_FILE_PATH}.restore"
+DB = SqliteDatabase(
+    None,
+    pragmas={
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -64 * 1000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+    },
+)
 
 #: Temporary directory name
 TMP_DIR = "___tmp_crc_encrypt___"
 
+#: Number of decrypted private keys kept in memory during a session
+KEY_CACHE_SIZE = 16
+
+#: RSA key size for new key pairs, equivalent to 128-bit symmetric security
+RSA_KEY_SIZE = 3072
+
+#: Number of RSA private keys the GUI generates ahead of time
+KEY_POOL_SIZE = 4
+
+#: Most threads writing key files at once when exporting every key pair
+KEY_EXPORT_WORKERS = 8
+
+#: Number of bytes read at a time when streaming files through encryption
+CHUNK_SIZE = 1024 * 1024
+
+#: Largest plaintext archive held in memory before it is spilled to disk
+SPOOL_SIZE = 64 * 1024 * 1024
+
+#: Deflate level for source data, higher levels cost more CPU for little gain
+COMPRESS_LEVEL = 6
+
+#: Fewest files in a directory before they are compressed in parallel
+PARALLEL_MIN_FILES = 8
+
+#: Largest file compressed in memory by a worker, larger files are streamed
+PARALLEL_MAX_SIZE = 16 * 1024 * 1024
+
+#: Leading bytes of file formats that are already compressed
+COMPRESSED_MAGIC = (
+    b"\x89PNG",  # PNG
+    b"\xff\xd8\xff",  # JPEG
+    b"GIF8",  # GIF
+    b"PK\x03\x04",  # Zip and Office documents
+    b"\x1f\x8b",  # Gzip
+    b"BZh",  # Bzip2
+    b"\xfd7zXZ",  # XZ
+    b"7z\xbc\xaf",  # 7-Zip
+    b"Rar!",  # RAR
+    b"\x28\xb5\x2f\xfd",  # Zstandard
+    b"OggS",  # Ogg
+    b"fLaC",  # FLAC
+    b"ID3",  # MP3
+)
+
+#: OpenSSL capability bits for the AES-NI and PCLMULQDQ instructions
+AES_NI_CAPS = (1 << 57) | (1 << 33)
+
+# AES-256-GCM archive format. The version byte can never begin a legacy Fernet
+# token as those are base64 encoded and always begin with "g".
+GCM_VERSION = b"\x01"
+GCM_KEY_SIZE = 32
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+
+# Symmetric keys are encrypted using RSA-OAEP with SHA-256 and prefixed with
+# this version byte. Keys from older versions have no prefix and use SHA-512.
+KEY_VERSION = b"\x01"
+
 # Strings appended to particular files
-FILE_UNENCRYPTED = "_UNENCRYPTED.zip"
 FILE_KEY = "_KEY.key"
 FILE_CRYPT = "_ENCRYPTED.zip"
 FILE_PUB = "_public.key"
@@ -35,12 +101,22 @@ HELP = {
     "priv": "The path to the private key file.",
     "pub": "The path to the public key file.",
     "arch": "The file name of the archive.",
+    "store": "A boolean flag used to skip compressing the source.",
 }
 
 # GUI parameters
 TABLE_SIZE_FACTOR = 14
 TABLE_SIZE_FACTOR_MOBILE = 50
 
+#: Number of rows added to a GUI table per frame while it loads
+TABLE_PAGE_SIZE = 50
+
+#: Seconds a GUI table waits to coalesce changes to its size, one frame
+TABLE_RESIZE_DELAY = 1 / 60
+
+#: Seconds a hidden GUI tab keeps its layout before it is released
+TAB_RELEASE_DELAY = 60
+
 # Password strength messages
 special_msg = "Passwords should have 2 or more special characters: "
 PW_MSG = {
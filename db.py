@@ -59,6 +59,42 @@ def init_db(db_path):
     DB.create_tables([Archive, KeyPair, Password])
 
 
+def db_checkpoint():
+    """Moves all changes in the write-ahead log into the database file.
+
+    This must be done before the database file is copied or replaced. The log
+    cannot be emptied while another connection is still reading from it.
+
+    Returns:
+        bool: True if every change is in the database file, otherwise False.
+    """
+    busy, _, _ = DB.execute_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return not busy
+
+
+def db_replace(path):
+    """Replaces the database file with another database file.
+
+    Connections are kept per thread, so any other thread that has used the
+    database must close its connection first. The write-ahead log and shared
+    memory index of the old database are removed so that neither is applied
+    to the new database file.
+
+    Args:
+        path (str): The database file that will replace the current one.
+    """
+    if DB.database == DB_FILE_PATH:
+        DB.close()
+
+    for suffix in ("-wal", "-shm"):
+        try:
+            os.remove(f"{DB_FILE_PATH}{suffix}")
+        except FileNotFoundError:
+            pass
+
+    os.replace(path, DB_FILE_PATH)
+
+
 def db_exists():
     """Checks if the database exists.
 
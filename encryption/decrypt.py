@@ -1,59 +1,122 @@
 """Functions related to decryption."""
 
+import logging
 import os
+from base64 import urlsafe_b64decode
 from shutil import copyfile
 from zipfile import ZipFile
 
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidSignature, InvalidTag
+from cryptography.fernet import InvalidToken
+from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers import algorithms, Cipher, modes
+from cryptography.hazmat.primitives.hmac import HMAC
+from cryptography.hazmat.primitives.padding import PKCS7
 from cryptography.hazmat.primitives import hashes
 from peewee import DoesNotExist
 
-from config import DB_FILE, DB_FILE_PATH, DB_PATH, TMP_DIR
-from db import KeyPair
+from config import (
+    CHUNK_SIZE,
+    DB,
+    DB_FILE,
+    DB_FILE_PATH,
+    DB_PATH,
+    DB_RESTORE_FILE_PATH,
+    FILE_CRYPT,
+    FILE_KEY,
+    FILE_PRIV,
+    GCM_KEY_SIZE,
+    GCM_NONCE_SIZE,
+    GCM_TAG_SIZE,
+    GCM_VERSION,
+    KEY_VERSION,
+    TMP_DIR,
+)
+from db import db_checkpoint, db_replace
 from encryption.keys import load_private_key
 from utils.archive import extract_files
-from utils.helpers import Result
+from utils.helpers import get_key_pair, Result
 
+#: The OpenSSL backend, looked up once rather than for every archive
+_backend = default_backend()
 
-def db_restore_wrapper(source, password):
+#: Logger for messages that are also returned to the caller
+log = logging.getLogger(__name__)
+
+
+def db_restore_wrapper(source, password, replace=True):
     """Wrapper function used as the main entry point to decrypt an archive.
 
+    The backup is fully decrypted to DB_RESTORE_FILE_PATH before the DB file
+    is replaced. Connections are kept per thread, so a caller with other
+    threads using the DB can replace the file itself with db_replace once
+    every connection has been closed.
+
     Args:
         source (str): Path to the source file archive that is to be decrypted.
         password (str): The password used to encrypt the symmetric key.
+        replace (Optional[bool]): True to replace the DB file with the backup,
+            defaults to True.
     """
     source_path = os.path.abspath(source)
     source = os.path.basename(source)
 
-    # Backup the original DB file
-    count = 1
-    backup_file = os.path.join(DB_PATH, f"{DB_FILE}.back_{count}")
-    while os.path.exists(backup_file):
-        count += 1
-        backup_file = os.path.join(DB_PATH, f"{DB_FILE}.back_{count}")
-    copyfile(DB_FILE_PATH, backup_file)
+    # Backup the original DB file after the highest existing backup number
+    prefix = f"{DB_FILE}.back_"
+    suffixes = [
+        entry.name.replace(prefix, "", 1)
+        for entry in os.scandir(DB_PATH)
+        if entry.name.startswith(prefix)
+    ]
+    count = max((int(s) for s in suffixes if s.isdigit()), default=0) + 1
+
+    # Ensure recent changes are in the DB file rather than the write-ahead log
+    if not db_checkpoint():
+        msg = "The database is busy, close any open tables and try again"
+        log.warning(msg)
+        return Result(False, msg)
 
-    # Extract the DB backup
-    tmp_path = os.path.join(DB_PATH, TMP_DIR)
-    extract_files(source_path, tmp_path)
+    copyfile(DB_FILE_PATH, os.path.join(DB_PATH, f"{prefix}{count}"))
 
-    # Inspect the DB backup zip for the private key
-    private_path = None
+    # Close this thread's connection as it must not outlive the DB file
+    if DB.database == DB_FILE_PATH:
+        DB.close()
 
-    with ZipFile(source_path, "r") as zip_file:
-        files = zip_file.namelist()
+    # Read the private key into memory and only extract the encrypted
+    # archive and its symmetric key from the DB backup
+    tmp_path = os.path.join(DB_PATH, TMP_DIR)
+    private_key_bytes = None
 
-    for file in files:
-        if "_PRIVATE.key" in file:
-            private_path = os.path.join(tmp_path, file)
-            break
+    with ZipFile(source_path, "r") as zip_file:
+        for info in zip_file.infolist():
+            if info.filename.endswith(FILE_PRIV):
+                private_key_bytes = zip_file.read(info)
+            elif info.filename.endswith((FILE_CRYPT, FILE_KEY)):
+                zip_file.extract(info, tmp_path)
+
+    if private_key_bytes is None:
+        msg = "The database backup does not contain a private key"
+        log.warning(msg)
+        return Result(False, msg)
 
-    # Read the private key and decrypt the backup
-    with open(private_path, "rb") as private_key_file:
-        private_key_bytes = private_key_file.read()
     decrypt_backup(source, DB_PATH, private_key_bytes, password)
 
+    restored_path = os.path.join(tmp_path, DB_FILE)
+    if not os.path.isfile(restored_path):
+        msg = "The database backup does not contain a database"
+        log.warning(msg)
+        return Result(False, msg)
+
+    # Move the restored DB out of the temporary directory, which is removed
+    # once the restore finishes
+    os.replace(restored_path, DB_RESTORE_FILE_PATH)
+    if replace:
+        db_replace(DB_RESTORE_FILE_PATH)
+
+    # Cached key pairs may no longer match the restored database
+    get_key_pair.cache_clear()
+
     return Result(True, "")
 
 
@@ -73,11 +136,11 @@ def decrypt_archive(source, destination, key_pair_name, pw=None):
     # Ensure the source and destination are valid
     if not os.path.isdir(destination):
         msg = "The destination must be a directory"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
     elif not os.path.isfile(source):
         msg = "The source must be a file"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
     # Set the name for the decrypted archive
@@ -86,10 +149,10 @@ def decrypt_archive(source, destination, key_pair_name, pw=None):
 
     # Get the private key from the key pair provided
     try:
-        private_key = KeyPair.get(KeyPair.name == key_pair_name).private_key
+        private_key = get_key_pair(key_pair_name).private_key
     except DoesNotExist:
         msg = f"Key pair does not exist : {key_pair_name}"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
     # Create a temporary working directory
@@ -106,48 +169,194 @@ def decrypt_archive(source, destination, key_pair_name, pw=None):
 def decrypt_backup(source, destination, private_key_bytes, pw):
     """Decrypts a DB backup archive.
 
+    The backup is extracted into the temporary directory rather than the
+    destination, so the DB file is not overwritten while it is in use.
+
     Args:
         source (str): Path to the encrypted DB backup archive.
-        destination (str): Where the decrypted backup archive will be stored.
+        destination (str): Where the temporary directory was created.
         private_key_bytes (bytes): The private key as bytes.
         pw (str): The password used to encrypt the private key.
     """
     base_name = os.path.splitext(os.path.basename(source))[0]
     name = base_name.replace("_ENCRYPTED", "")
+    output = os.path.join(destination, TMP_DIR)
 
-    decrypt_core(destination, private_key_bytes, pw, base_name, name)
+    decrypt_core(destination, private_key_bytes, pw, base_name, name, output)
 
 
-def decrypt_core(destination, private_key, pw, base_name, name):
+def decrypt_core(destination, private_key, pw, base_name, name, output=None):
     """The main shared logic used for archive decryption.
 
     Args:
-        destination (str): Where the decrypted archive will be stored.
+        destination (str): Where the temporary directory was created and,
+            unless an output is given, where the decrypted archive is stored.
         private_key (bytes): The private key as bytes.
         pw (str): The password used to encrypt the private key.
         base_name (str): The name of the archive.
         name (str): The name of the archive with temporary tags removed.
+        output (Optional[str]): Where the decrypted archive will be stored,
+            defaults to the destination.
     """
-    tmp_dir = os.path.join(destination, TMP_DIR)
+    # Every working file shares the temporary directory, so join it only once
+    tmp_dir = f"{os.path.join(destination, TMP_DIR)}{os.sep}"
 
     # Decrypt the symmetric key
-    sym_key_path = os.path.join(tmp_dir, f"{base_name}_KEY.key")
+    sym_key_path = f"{tmp_dir}{base_name}{FILE_KEY}"
     symmetric_key = decrypt_symmetric_key(private_key, sym_key_path, pw)
 
-    # Read the encrypted archive as bytes
-    source_path = os.path.join(tmp_dir, f"{base_name}_ENCRYPTED.zip")
+    # Decrypt the archive directly into a temporary file
+    source_path = f"{tmp_dir}{base_name}{FILE_CRYPT}"
+    decrypted_archive = f"{tmp_dir}{name}_TMP.zip"
     with open(source_path, "rb") as src_file:
-        encrypted_archive_bytes = src_file.read()
+        with open(decrypted_archive, "xb") as dst_file:
+            decrypt_stream(src_file, dst_file, symmetric_key)
+
+    extract_files(decrypted_archive, output or destination)
 
-    # Decrypt the archive using the symmetric key
-    archive_bytes = Fernet(symmetric_key).decrypt(encrypted_archive_bytes)
 
-    # Store the decrypted archive
-    decrypted_archive = f"{os.path.join(tmp_dir, name)}_TMP.zip"
-    with open(decrypted_archive, "xb") as dst_file:
-        dst_file.write(archive_bytes)
+def decrypt_stream(source_file, dest_file, symmetric_key):
+    """Decrypts an encrypted archive from a file object one chunk at a time.
+
+    Archives are AES-256-GCM encrypted unless they were created by an older
+    version of this application, in which case they are Fernet tokens. Either
+    way the data can only be authenticated once all of it has been read, so
+    the output must not be trusted unless this function returns normally.
+
+    Args:
+        source_file (BinaryIO): The encrypted archive.
+        dest_file (BinaryIO): Where the decrypted data will be written.
+        symmetric_key (bytes): The symmetric key used to encrypt the data.
+
+    Raises:
+        InvalidTag: The AES-256-GCM archive fails authentication.
+        InvalidToken: The Fernet token is malformed or fails authentication.
+    """
+    version = source_file.read(len(GCM_VERSION))
+    if version == GCM_VERSION:
+        _decrypt_gcm(source_file, dest_file, symmetric_key)
+    else:
+        _decrypt_fernet(source_file, dest_file, symmetric_key, version)
 
-    extract_files(decrypted_archive, destination)
+
+def _decrypt_gcm(source_file, dest_file, symmetric_key):
+    """Decrypts the remainder of an AES-256-GCM archive after its version byte.
+
+    Args:
+        source_file (BinaryIO): The encrypted archive.
+        dest_file (BinaryIO): Where the decrypted data will be written.
+        symmetric_key (bytes): The symmetric key used to encrypt the data.
+
+    Raises:
+        InvalidTag: The archive fails authentication.
+    """
+    nonce = source_file.read(GCM_NONCE_SIZE)
+    decryptor = Cipher(
+        algorithms.AES(symmetric_key),
+        modes.GCM(nonce),
+        backend=_backend,
+    ).decryptor()
+
+    # Reuse a single output buffer, with room for one extra block, for every
+    # chunk of plaintext
+    buffer = bytearray(CHUNK_SIZE + algorithms.AES.block_size // 8)
+    view = memoryview(buffer)
+    tag = b""
+
+    chunk = source_file.read(CHUNK_SIZE)
+    while chunk:
+        if len(chunk) < GCM_TAG_SIZE:
+            chunk = tag + chunk
+            tag = b""
+
+        # Always hold back the last bytes read as they may be the GCM tag
+        count = decryptor.update_into(tag, buffer)
+        dest_file.write(view[:count])
+        ciphertext = memoryview(chunk)[:-GCM_TAG_SIZE]
+        count = decryptor.update_into(ciphertext, buffer)
+        dest_file.write(view[:count])
+        tag = chunk[-GCM_TAG_SIZE:]
+        chunk = source_file.read(CHUNK_SIZE)
+
+    if len(tag) != GCM_TAG_SIZE:
+        raise InvalidTag
+
+    dest_file.write(decryptor.finalize_with_tag(tag))
+
+
+def _decrypt_fernet(source_file, dest_file, symmetric_key, prefix=b""):
+    """Decrypts a legacy Fernet token from a file object.
+
+    Args:
+        source_file (BinaryIO): The base64 encoded Fernet token.
+        dest_file (BinaryIO): Where the decrypted data will be written.
+        symmetric_key (bytes): The decoded Fernet key.
+        prefix (Optional[bytes]): Any leading bytes already read from the file.
+
+    Raises:
+        InvalidToken: The token is malformed or its signature is invalid.
+    """
+    signer = HMAC(symmetric_key[:16], hashes.SHA256(), backend=_backend)
+    decryptor = None
+    pending = b""
+
+    for data in _b64_decode_chunks(source_file, prefix):
+        pending += data
+
+        # Read the version, timestamp, and IV from the token's header
+        if decryptor is None:
+            if len(pending) < 25:
+                continue
+            if pending[:1] != b"\x80":
+                raise InvalidToken
+            signer.update(pending[:25])
+            iv = pending[9:25]
+            decryptor = Cipher(
+                algorithms.AES(symmetric_key[16:]),
+                modes.CBC(iv),
+                backend=_backend,
+            ).decryptor()
+            unpadder = PKCS7(algorithms.AES.block_size).unpadder()
+            pending = pending[25:]
+
+        # Hold back the last 32 bytes as they may be the HMAC signature
+        ciphertext, pending = pending[:-32], pending[-32:]
+        signer.update(ciphertext)
+        dest_file.write(unpadder.update(decryptor.update(ciphertext)))
+
+    if decryptor is None or len(pending) != 32:
+        raise InvalidToken
+
+    try:
+        signer.verify(pending)
+        dest_file.write(
+            unpadder.update(decryptor.finalize()) + unpadder.finalize()
+        )
+    except (InvalidSignature, ValueError):
+        raise InvalidToken
+
+
+def _b64_decode_chunks(source_file, remainder=b""):
+    """Yields base64 decoded bytes of a file object one chunk at a time.
+
+    Args:
+        source_file (BinaryIO): The base64 encoded data.
+        remainder (Optional[bytes]): Any leading data already read.
+
+    Yields:
+        bytes: The decoded data.
+    """
+
+    chunk = source_file.read(CHUNK_SIZE)
+    while chunk:
+        data = remainder + chunk
+        cut = len(data) - len(data) % 4
+        yield urlsafe_b64decode(data[:cut])
+        remainder = data[cut:]
+        chunk = source_file.read(CHUNK_SIZE)
+
+    if remainder:
+        raise InvalidToken
 
 
 def decrypt_symmetric_key(private_key_bytes, symmetric_key_path, pw=None):
@@ -159,7 +368,7 @@ def decrypt_symmetric_key(private_key_bytes, symmetric_key_path, pw=None):
         pw (Optional[str]): The password used to decrypt the private key.
 
     Returns:
-        bytes: The decrypted symmetric key.
+        bytes: The decrypted 256-bit symmetric key.
     """
 
     with open(symmetric_key_path, "rb") as symmetric_key_file:
@@ -167,14 +376,28 @@ def decrypt_symmetric_key(private_key_bytes, symmetric_key_path, pw=None):
 
     private_key = load_private_key(private_key_bytes, pw)
 
+    # RSA ciphertext is exactly the size of the key, so keys encrypted by
+    # older versions using SHA-512 are the only ones without a version byte
+    if len(encrypted_symmetric_key) == private_key.key_size // 8:
+        algorithm = hashes.SHA512()
+    elif encrypted_symmetric_key[:1] == KEY_VERSION:
+        algorithm = hashes.SHA256()
+        encrypted_symmetric_key = encrypted_symmetric_key[1:]
+    else:
+        raise ValueError("Unsupported symmetric key format")
+
     # Decrypt the symmetric key
     symmetric_key_bytes = private_key.decrypt(
         encrypted_symmetric_key,
         padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA512()),
-            algorithm=hashes.SHA512(),
+            mgf=padding.MGF1(algorithm=algorithm),
+            algorithm=algorithm,
             label=None,
         ),
     )
 
+    # Keys from older versions are base64 encoded Fernet keys
+    if len(symmetric_key_bytes) != GCM_KEY_SIZE:
+        symmetric_key_bytes = urlsafe_b64decode(symmetric_key_bytes)
+
     return symmetric_key_bytes
@@ -1,30 +1,69 @@
 """Functions related to encryption."""
 
+import logging
 import os
-from zipfile import ZipFile, ZIP_DEFLATED
+from tempfile import SpooledTemporaryFile
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-from cryptography.fernet import Fernet
+from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers import algorithms, Cipher, modes
 from cryptography.hazmat.primitives import hashes
 
-
 from config import (
+    AES_NI_CAPS,
+    CHUNK_SIZE,
+    COMPRESS_LEVEL,
     DB_FILE_PATH,
     FILE_CRYPT,
     FILE_KEY,
     FILE_PRIV,
     FILE_PUB,
-    FILE_UNENCRYPTED,
-    TMP_DIR,
-)
-from db import Archive, KeyPair
-from encryption.keys import (
-    generate_symmetric_key,
-    load_public_key,
-    write_key_pair,
+    GCM_NONCE_SIZE,
+    GCM_VERSION,
+    KEY_VERSION,
+    SPOOL_SIZE,
 )
-from utils.archive import zip_dir, zip_files
-from utils.helpers import Result
+from db import Archive, db_checkpoint
+from encryption.keys import generate_symmetric_key, load_public_key
+from utils.archive import add_dir, add_files
+from utils.helpers import get_key_pair, Result
+
+#: The OpenSSL backend, looked up once rather than for every archive
+_backend = default_backend()
+
+#: Logger for messages that are also returned to the caller
+log = logging.getLogger(__name__)
+
+
+def check_aes_ni():
+    """Checks that OpenSSL has not been told to ignore AES-NI.
+
+    AES-256-GCM is an order of magnitude slower without the AES-NI and
+    PCLMULQDQ instructions, which can be masked out of OpenSSL's capability
+    vector using the OPENSSL_ia32cap environment variable.
+
+    Returns:
+        Result: Details of the function's results. The message holds the
+        OpenSSL version if AES-NI is available.
+    """
+    version = openssl_version()
+    cap = os.environ.get("OPENSSL_ia32cap", "").split(":")[0]
+
+    # A leading "~" clears the given bits, otherwise the value replaces the
+    # capability vector
+    try:
+        value = int(cap.lstrip("~"), 0)
+    except ValueError:
+        return Result(True, version)
+    disabled = value if cap.startswith("~") else ~value
+
+    if disabled & AES_NI_CAPS:
+        msg = f"AES-NI is disabled by OPENSSL_ia32cap for {version}"
+        log.warning(msg)
+        return Result(False, msg)
+
+    return Result(True, version)
 
 
 def db_backup_wrapper(dst, key_pair_name):
@@ -37,72 +76,80 @@ def db_backup_wrapper(dst, key_pair_name):
     msg = ""
     source = DB_FILE_PATH
     destination = os.path.abspath(dst)
-    key_pair = KeyPair.get(KeyPair.name == key_pair_name)
+    key_pair = get_key_pair(key_pair_name)
 
     # Ensure the destination is a directory
     if not os.path.isdir(dst):
         msg = "The destination must be a directory"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
     # Verify that the key pair has a password
-    if not key_pair.password:
+    if not key_pair.password_id:
         msg = "A password protected key pair must be used for database backups"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
-    elif not key_pair.password.strong:
+    elif not key_pair.password_strong:
         msg = "Using a key pair with a weak password"
-        print(msg)
+        log.warning(msg)
 
-    encrypt_wrapper(source, destination, key_pair_name)
+    # Ensure recent changes are in the DB file rather than the write-ahead log
+    if not db_checkpoint():
+        msg = "The database is busy, close any open tables and try again"
+        log.warning(msg)
+        return Result(False, msg)
 
-    tmp_path = os.path.abspath(os.path.join(destination, TMP_DIR))
-    write_key_pair(key_pair_name, tmp_path)
+    encrypt_wrapper(source, destination, key_pair_name)
 
     # Add the key pair to the DB backup bundle
     archive_path = os.path.join(destination, f"{os.path.basename(source)}.zip")
-    priv_path = os.path.join(tmp_path, f"{key_pair_name}{FILE_PRIV}")
-    pub_path = os.path.join(tmp_path, f"{key_pair_name}{FILE_PUB}")
-    with ZipFile(archive_path, "a", ZIP_DEFLATED, compresslevel=9) as zip_file:
-        zip_file.write(priv_path, os.path.basename(priv_path))
-        zip_file.write(pub_path, os.path.basename(pub_path))
+    with ZipFile(archive_path, "a", ZIP_STORED) as zip_file:
+        zip_file.writestr(f"{key_pair.name}{FILE_PRIV}", key_pair.private_key)
+        zip_file.writestr(f"{key_pair.name}{FILE_PUB}", key_pair.public_key)
 
     return Result(True, msg)
 
 
-def encrypt_archive(name, archive, destination, symmetric_key):
-    """Encrypts a zip archive using a symmetric key.
+def encrypt_stream(source_file, dest_file, symmetric_key):
+    """Encrypts a file object using AES-256-GCM one chunk at a time.
 
-    Args:
-        name (str): The name of the encrypted archive to be created.
-        archive (str): Path to the zip file to be encrypted.
-        destination (str): Where to store the encrypted archive.
-        symmetric_key (bytes): The symmetric key used to encrypt the archive.
+    The output consists of a version byte, the nonce, the ciphertext, and
+    finally the GCM tag. Only a single chunk of the source is held in memory
+    at any given time.
 
-    Returns:
-        str: The path to the encrypted output archive.
+    Args:
+        source_file (BinaryIO): The plaintext to be encrypted.
+        dest_file (BinaryIO): Where the encrypted data will be written.
+        symmetric_key (bytes): The symmetric key used to encrypt the data.
     """
-    output_file = os.path.join(destination, name)
-    with open(archive, "rb") as source_file:
-        archive_bytes = source_file.read()
-
-    # Encrypt the archive
-    encrypted_archive_bytes = Fernet(symmetric_key).encrypt(archive_bytes)
-
-    # Store the encrypted archive
-    with open(output_file, "xb") as dest_file:
-        dest_file.write(encrypted_archive_bytes)
-
-    return output_file
-
-
-def encrypt_symmetric_key(name, public_key_bytes, destination, symmetric_key):
+    nonce = os.urandom(GCM_NONCE_SIZE)
+    encryptor = Cipher(
+        algorithms.AES(symmetric_key),
+        modes.GCM(nonce),
+        backend=_backend,
+    ).encryptor()
+
+    # Reuse a single output buffer, with room for one extra block, for every
+    # chunk of ciphertext
+    buffer = bytearray(CHUNK_SIZE + algorithms.AES.block_size // 8)
+    view = memoryview(buffer)
+
+    dest_file.write(GCM_VERSION + nonce)
+    chunk = source_file.read(CHUNK_SIZE)
+    while chunk:
+        count = encryptor.update_into(chunk, buffer)
+        dest_file.write(view[:count])
+        chunk = source_file.read(CHUNK_SIZE)
+
+    dest_file.write(encryptor.finalize())
+    dest_file.write(encryptor.tag)
+
+
+def encrypt_symmetric_key(public_key_bytes, symmetric_key):
     """Encrypts a symmetric key using an asymmetric public key.
 
     Args:
-        name (str): The name of the symmetric key.
         public_key_bytes (bytes): Public key used to encrypt the symmetric key.
-        destination (str): Where the encrypted symmetric key will be stored.
         symmetric_key (bytes): The symmetric key to be encrypted.
 
     Returns:
@@ -111,32 +158,29 @@ def encrypt_symmetric_key(name, public_key_bytes, destination, symmetric_key):
     public_key = load_public_key(public_key_bytes)
 
     # Encrypt the symmetric key using the public key
-    encrypted_symmetric_key = public_key.encrypt(
+    return KEY_VERSION + public_key.encrypt(
         symmetric_key,
         padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA512()),
-            algorithm=hashes.SHA512(),
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
             label=None,
         ),
     )
 
-    # Store the encrypted symmetric key at the desired location
-    key_file = os.path.join(destination, name)
-    with open(key_file, "xb") as dest_file:
-        dest_file.write(encrypted_symmetric_key)
-
-    return encrypted_symmetric_key
 
-
-def encrypt_wrapper(source, dst, key_pair_name):
+def encrypt_wrapper(source, dst, key_pair_name, compression=ZIP_DEFLATED):
     """Wrapper function used as the main entry point to encrypt an archive.
 
+    The source is zipped into a spooled temporary file which is encrypted
+    directly into the output bundle, so no intermediate archives are written.
+
     Args:
         source (str): Path to the file or directory that will be encrypted.
         dst (str): Path where the encrypted archive will be stored.
         key_pair_name (str): The name of the key pair used for the encryption.
+        compression (Optional[int]): The zipfile compression of the source.
     """
-    key_pair = KeyPair.get(KeyPair.name == key_pair_name)
+    key_pair = get_key_pair(key_pair_name)
 
     # Ensure if the source is a file or dir. Ensure the destination is a dir
     if os.path.isdir(source):
@@ -144,12 +188,12 @@ def encrypt_wrapper(source, dst, key_pair_name):
     elif os.path.isfile(source):
         is_dir = False
     else:
-        print("Source is invalid")
+        log.warning("Source is invalid")
         return Result(False, "Source is invalid")
 
     if not os.path.isdir(dst):
         msg = "The destination must be a directory"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
     # Get fully qualified paths for source and destination
@@ -157,37 +201,46 @@ def encrypt_wrapper(source, dst, key_pair_name):
     destination = os.path.abspath(dst)
 
     # Set the names of the archives and symmetric key based on the source
-    name = f"{os.path.basename(source)}"
-    name_unencrypted = f"{name}{FILE_UNENCRYPTED}"
+    name = os.path.basename(source)
     name_encrypted = f"{name}{FILE_CRYPT}"
     sym_key_name = f"{name}{FILE_KEY}"
-
-    tmp_dir = os.path.join(destination, TMP_DIR)
-    os.mkdir(tmp_dir)
-
-    if is_dir:
-        zip_dir(name_unencrypted, source, tmp_dir)
-    else:
-        zip_files(name_unencrypted, [source], tmp_dir)
+    bundle_path = os.path.join(destination, f"{name}.zip")
 
     sym_key_bytes = generate_symmetric_key()
 
-    # Encrypt the archive using the symmetric key
-    archive = os.path.join(tmp_dir, name_unencrypted)
-    encrypt_archive(name_encrypted, archive, tmp_dir, sym_key_bytes)
-
     # Encrypt the symmetric key using the asymmetric key pair
-    encrypt_symmetric_key(
-        sym_key_name, key_pair.public_key, tmp_dir, sym_key_bytes
-    )
-
-    # Zip the encrypted archive and the symmetric key into one zip bundle
-    sym_key_path = os.path.join(tmp_dir, sym_key_name)
-    encrypted_arch_path = os.path.join(tmp_dir, name_encrypted)
-    zip_files(f"{name}.zip", [encrypted_arch_path, sym_key_path], destination)
+    sym_key_crypt = encrypt_symmetric_key(key_pair.public_key, sym_key_bytes)
+
+    with SpooledTemporaryFile(SPOOL_SIZE, dir=destination) as archive:
+
+        # Zip the source, spilling to disk only if it is too large for memory
+        with ZipFile(
+            archive, "w", compression, compresslevel=COMPRESS_LEVEL
+        ) as zip_file:
+            if is_dir:
+                add_dir(zip_file, source)
+            else:
+                add_files(zip_file, [source])
+        archive.seek(0)
+
+        # Encrypt the archive straight into the bundle alongside the key. The
+        # encrypted data will not compress so the bundle is stored as is.
+        with ZipFile(bundle_path, "x", ZIP_STORED) as bundle:
+            with bundle.open(name_encrypted, "w", force_zip64=True) as member:
+                encrypt_stream(archive, member, sym_key_bytes)
+            bundle.writestr(sym_key_name, sym_key_crypt)
 
     Archive.create(
-        name=name, src_path=source, dst_path=destination, key_pair=key_pair
+        name=name, src_path=source, dst_path=destination, key_pair=key_pair.id
     )
 
     return Result(True, "")
+
+
+def openssl_version():
+    """Looks up the version of OpenSSL used for encryption.
+
+    Returns:
+        str: The OpenSSL version text.
+    """
+    return _backend.openssl_version_text()
@@ -1,23 +1,56 @@
 """Functions related to symmetric and asymmetric cryptographic keys."""
 
+import logging
 import os
+import secrets
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from queue import Empty, Queue
+from threading import Lock, Thread
 
-from cryptography.fernet import Fernet
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 from peewee import IntegrityError
 
+from config import (
+    FILE_PRIV,
+    FILE_PUB,
+    GCM_KEY_SIZE,
+    KEY_CACHE_SIZE,
+    KEY_EXPORT_WORKERS,
+    KEY_POOL_SIZE,
+    RSA_KEY_SIZE,
+)
 from db import KeyPair, Password
-from utils.helpers import Result
+from utils.helpers import get_key_pair, Result
 from utils.validation import strong_password
 
+#: The OpenSSL backend, looked up once rather than for every key operation
+_backend = default_backend()
+
+#: Logger for messages that are also returned to the caller
+log = logging.getLogger(__name__)
+
+#: Loaded private keys keyed by digests of the key and password. The digests
+#: are keyed with a per session secret so that the password is never held,
+#: but the decrypted keys stay in memory for the rest of the session. Keys are
+#: loaded on several threads, so the cache is only used while holding its lock.
+_private_keys = {}
+_private_keys_lock = Lock()
+_digest_key = secrets.token_bytes(32)
+
+#: RSA private keys generated ahead of time, see start_key_pool
+_key_pool = Queue(KEY_POOL_SIZE)
+
 
 def generate_asymmetric_key_pair(name, hint="", pw=None):
     """Generates an asymmetric key pair.
 
     The private key can optionally be protected with a password. The keys are
-    RSA format using a key size of 4096 with PEM encoding.
+    RSA format using a key size of RSA_KEY_SIZE with PEM encoding.
 
     Args:
         name (str): Used to uniquely name the keys.
@@ -29,31 +62,32 @@ def generate_asymmetric_key_pair(name, hint="", pw=None):
     """
     password = None
     pw_msg = ""
-    private_key = rsa.generate_private_key(
-        public_exponent=65537, key_size=4096, backend=default_backend()
-    )
-    public_key = private_key.public_key()
+    pw_bytes = pw.encode("utf-8") if pw else None
 
-    # Get the private key as bytes. Only encrypt the private key using a
-    # password if a password is provided.
+    # Validate the password before spending a private key on it
     if pw:
-        # Validate the password
         result = strong_password(pw)
         pw_msg = result.msg
         if not result.success:
             return result
 
+    # Use a key generated ahead of time if one is available
+    try:
+        private_key = _key_pool.get_nowait()
+    except Empty:
+        private_key = _generate_private_key()
+    public_key = private_key.public_key()
+
+    # Get the private key as bytes. Only encrypt the private key using a
+    # password if a password is provided.
+    if pw:
         private_bytes = private_key.private_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.BestAvailableEncryption(
-                pw.encode("utf-8")
+                pw_bytes
             ),
         )
-        password = Password(
-            hint=hint, strong=True if result.msg == "" else False,
-        )
-        password.save()
     else:
         private_bytes = private_key.private_bytes(
             encoding=serialization.Encoding.PEM,
@@ -67,20 +101,46 @@ def generate_asymmetric_key_pair(name, hint="", pw=None):
         format=serialization.PublicFormat.SubjectPublicKeyInfo,
     )
 
+    # Only save the password once the keys exist so that a failure above does
+    # not leave an orphaned password
+    if pw:
+        password = Password(hint=hint, strong=pw_msg == "")
+        password.save()
+
     # Write the key pair to the database. Include the password if provided.
     result = store_key_pair(name, public_bytes, private_bytes, password)
+
+    # Cache the key so that its first use skips the password's key derivation
+    if result.success:
+        _cache_private_key(
+            _private_key_cache_key(private_bytes, pw_bytes), private_key
+        )
+
     return Result(
         result.success, f"{pw_msg}\n\n{result.msg}" if pw_msg else result.msg
     )
 
 
+def _generate_private_key():
+    """Generates an RSA private key using a key size of RSA_KEY_SIZE.
+
+    Returns:
+        A private key object.
+    """
+    return rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=RSA_KEY_SIZE,
+        backend=_backend,
+    )
+
+
 def generate_symmetric_key():
-    """Generates a symmetric key using cryptography's Fernet.
+    """Generates a random 256-bit symmetric key for AES-256-GCM.
 
     Returns:
         bytes: The symmetric key.
     """
-    return Fernet.generate_key()
+    return secrets.token_bytes(GCM_KEY_SIZE)
 
 
 def import_key_pair(name, private_path, public_path, hint=None, pw=None):
@@ -97,11 +157,11 @@ def import_key_pair(name, private_path, public_path, hint=None, pw=None):
     # Test for existence of the key pair files provided
     if not os.path.isfile(private_path):
         msg = "The private key must be a valid file."
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
     elif not os.path.isfile(public_path):
         msg = "The public key must be a valid file."
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
     # Read the private and public key
@@ -123,7 +183,8 @@ def import_key_pair(name, private_path, public_path, hint=None, pw=None):
 
         # Store the password metadata in the DB
         password = Password(
-            hint=hint, strong=True if result.msg == "" else False,
+            hint=hint,
+            strong=True if result.msg == "" else False,
         )
         password.save()
 
@@ -138,6 +199,10 @@ def import_key_pair(name, private_path, public_path, hint=None, pw=None):
 def load_private_key(private_key_bytes, pw=None):
     """Reads a private key in the PEM format from a file.
 
+    Decrypting a password protected key runs a slow key derivation function,
+    so loaded keys are cached and stay decrypted in memory for the rest of the
+    session.
+
     Args:
         private_key_bytes (bytes): The private key as bytes.
         pw (Optional[str]): The password used to encrypt the private key.
@@ -147,20 +212,58 @@ def load_private_key(private_key_bytes, pw=None):
     """
 
     # Convert the password to bytes if it is provided
-    if pw:
-        pw = pw.encode("utf-8")
+    pw_bytes = pw.encode("utf-8") if pw else None
+
+    cache_key = _private_key_cache_key(private_key_bytes, pw_bytes)
+    with _private_keys_lock:
+        private_key = _private_keys.get(cache_key)
+
+    if private_key is None:
+        private_key = serialization.load_pem_private_key(
+            private_key_bytes, password=pw_bytes, backend=_backend
+        )
+        _cache_private_key(cache_key, private_key)
 
-    private_key = serialization.load_pem_private_key(
-        private_key_bytes,
-        password=pw if pw else None,
-        backend=default_backend(),
-    )
     return private_key
 
 
+def _private_key_cache_key(private_key_bytes, pw):
+    """Builds the key used to cache a loaded private key.
+
+    Args:
+        private_key_bytes (bytes): The private key as bytes.
+        pw (Optional[bytes]): The password used to encrypt the private key.
+
+    Returns:
+        tuple: Keyed digests of the private key and the password.
+    """
+    return (
+        blake2b(private_key_bytes, key=_digest_key).digest(),
+        blake2b(pw or b"", key=_digest_key).digest(),
+    )
+
+
+def _cache_private_key(cache_key, private_key):
+    """Caches a loaded private key, evicting the oldest once the cache is full.
+
+    Args:
+        cache_key (tuple): The key from _private_key_cache_key.
+        private_key: The private key object.
+    """
+    with _private_keys_lock:
+        full = len(_private_keys) >= KEY_CACHE_SIZE
+        if full and cache_key not in _private_keys:
+            _private_keys.pop(next(iter(_private_keys)))
+        _private_keys[cache_key] = private_key
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
 def load_public_key(public_key_bytes):
     """Loads a public key from bytes.
 
+    Public keys are not secret, so loaded keys are cached by their bytes and
+    reused for the rest of the session.
+
     Args:
         public_key_bytes (bytes): The public key as bytes.
 
@@ -168,11 +271,32 @@ def load_public_key(public_key_bytes):
         A public key object.
     """
     public_key = serialization.load_pem_public_key(
-        public_key_bytes, backend=default_backend()
+        public_key_bytes, backend=_backend
     )
     return public_key
 
 
+def start_key_pool():
+    """Starts generating RSA private keys ahead of time in the background.
+
+    RSA key generation takes seconds, so this lets key pairs be created while
+    the user is still filling in the form. The thread sleeps while the pool is
+    full and replaces keys as generate_asymmetric_key_pair takes them.
+
+    Returns:
+        Thread: The daemon thread filling the pool.
+    """
+    thread = Thread(target=_fill_key_pool, daemon=True)
+    thread.start()
+    return thread
+
+
+def _fill_key_pool():
+    """Keeps the pool of RSA private keys full until the application exits."""
+    while True:
+        _key_pool.put(_generate_private_key())
+
+
 def store_key_pair(name, public_bytes, private_bytes, password=None):
     """Writes the key pair to the database.
 
@@ -194,6 +318,8 @@ def store_key_pair(name, public_bytes, private_bytes, password=None):
     except IntegrityError:
         return Result(False, f'Key Pair with name "{name}" already exists')
 
+    get_key_pair.cache_clear()
+
     return Result(True, "")
 
 
@@ -203,19 +329,42 @@ def write_all_key_pairs(destination):
     Args:
         destination (str): The location to store the key files.
     """
-    key_pairs = KeyPair.select()
 
-    # Ensure the destination is a directory
-    if not os.path.isdir(destination):
+    # Listing the destination also ensures that it is a directory, without a
+    # separate stat call
+    try:
+        with os.scandir(destination) as entries:
+            existing = {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
         msg = "The destination must be a directory"
-        print(msg)
+        log.warning(msg)
         return Result(False, msg)
 
-    # Store each key pair in its own directory
-    for key_pair in key_pairs:
-        dst = os.path.join(destination, key_pair.name)
-        os.mkdir(dst)
-        write_key_pair(key_pair.name, dst)
+    # Check every key pair directory up front so that an existing directory
+    # does not leave the export half written
+    names = KeyPair.select(KeyPair.name).tuples()
+    conflicts = [name for name, in names if name in existing]
+    if conflicts:
+        msg = f"Key pair directories already exist : {', '.join(conflicts)}"
+        log.warning(msg)
+        return Result(False, msg)
+
+    # Store each key pair in its own directory. The rows are read on this
+    # thread without caching them, while a pool of threads overlaps the file
+    # writes. Only a couple of key pairs per thread are held in memory.
+    workers = min(KEY_EXPORT_WORKERS, os.cpu_count() or 1)
+    pending = deque()
+    with ThreadPoolExecutor(workers) as executor:
+        for key_pair in KeyPair.select().iterator():
+            dst = os.path.join(destination, key_pair.name)
+            os.mkdir(dst)
+            pending.append(executor.submit(_write_key_files, key_pair, dst))
+            if len(pending) > workers * 2:
+                pending.popleft().result()
+
+        # Surface any errors raised while writing the remaining key pairs
+        while pending:
+            pending.popleft().result()
 
     return Result(True, "")
 
@@ -227,20 +376,43 @@ def write_key_pair(name, destination):
         name (str): The name of the key pair to write to files.
         destination (str): The location to store the key files.
     """
-    key_pair = KeyPair.get(KeyPair.name == name)
 
     # Ensure the destination is a directory
     if not os.path.isdir(destination):
         msg = "The destination must be a directory"
-        print(msg)
+        log.warning(msg)
+        return Result(False, msg)
+
+    # Only read the columns needed to write the key files
+    key_pair = (
+        KeyPair.select(KeyPair.name, KeyPair.private_key, KeyPair.public_key)
+        .where(KeyPair.name == name)
+        .get()
+    )
+
+    return _write_key_files(key_pair, destination)
+
+
+def _write_key_files(key_pair, destination):
+    """Write a key pair that has been read from the DB to files.
+
+    Args:
+        key_pair (KeyPair): The key pair to write to files.
+        destination (str): The directory to store the key files.
+    """
+
+    # Ensure neither key file exists before writing either of them
+    private_path = os.path.join(destination, f"{key_pair.name}{FILE_PRIV}")
+    public_path = os.path.join(destination, f"{key_pair.name}{FILE_PUB}")
+    if os.path.exists(private_path) or os.path.exists(public_path):
+        msg = "The key files already exist in the destination"
+        log.warning(msg)
         return Result(False, msg)
 
     # Store the key pairs in files
-    private_name = f"{key_pair.name}_PRIVATE.key"
-    public_name = f"{key_pair.name}_public.key"
-    with open(os.path.join(destination, private_name), "xb") as private_key:
+    with open(private_path, "xb") as private_key:
         private_key.write(key_pair.private_key)
-    with open(os.path.join(destination, public_name), "xb") as public_key:
+    with open(public_path, "xb") as public_key:
         public_key.write(key_pair.public_key)
 
     return Result(True, "")
@@ -1,8 +1,12 @@
 """The main Kivy based GUI application."""
 
-from threading import Thread
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
 from kivy.uix.actionbar import (
     ActionBar,
     ActionButton,
@@ -13,18 +17,24 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.modalview import ModalView
 from kivy.uix.rst import RstDocument
-from kivy.uix.tabbedpanel import TabbedPanel
 
-from config import DB_PATH, INFO_TXT
+from config import DB_PATH, DB_RESTORE_FILE_PATH, INFO_TXT
+from db import db_replace
 from encryption.decrypt import db_restore_wrapper, decrypt_archive
-from encryption.encrypt import db_backup_wrapper, encrypt_wrapper
+from encryption.encrypt import (
+    check_aes_ni,
+    db_backup_wrapper,
+    encrypt_wrapper,
+    openssl_version,
+)
 from encryption.keys import (
     generate_asymmetric_key_pair,
     import_key_pair,
+    start_key_pool,
     write_all_key_pairs,
     write_key_pair,
 )
-from gui.callback import archives_cb, help_cb, key_pairs_cb
+from gui.callback import archives_cb, help_cb, key_pairs_cb, win_resize_cb
 from gui.tab import (
     DatabaseBackupTab,
     DatabaseRestoreTab,
@@ -34,10 +44,13 @@ from gui.tab import (
     ExportTab,
     GenerateTab,
     ImportTab,
+    LazyTabbedPanel,
 )
-from utils.helpers import get_key_names, gui_thread
+from utils.helpers import cleanup, get_key_names, gui_thread, Result
 from utils.validation import validate_required
 
+log = logging.getLogger(__name__)
+
 
 class AppGUI(App):
     """Kivy GUI based application.
@@ -51,9 +64,12 @@ class AppGUI(App):
 
     Attributes:
         title (str): The window's title
+        aes_ni (Result): Whether encryption will use AES-NI.
         key_names (list[str]): All of the key pair names from the DB.
         popup_msg (ModalView): A popup that shows an informational message.
         popup_err (ModalView): A popup that shows a warning or error message.
+        popup_msg_rst (RstDocument): The message shown by popup_msg.
+        popup_err_rst (RstDocument): The message shown by popup_err.
         encrypt_tab (EncryptTab): The encrypt tab object.
         decrypt_tab (DecryptTab): The decrypt tab object.
         generate_tab (GenerateTab): The generate new keys tab object.
@@ -62,6 +78,10 @@ class AppGUI(App):
         import_tab (ImportTab): The import a key tab object.
         export_tab (ExportTab): The export one key tab object.
         export_all_tab (ExportAllTab): The export all keys tab object.
+        tabs (tuple[TabbedPanelItem]): Every tab object in display order.
+        key_tabs (tuple[TabbedPanelItem]): Tabs with a key pair drop down.
+        tab_panel (LazyTabbedPanel): The panel holding the tabs, once built.
+        executor (ThreadPoolExecutor): Runs functions off of the GUI thread.
     """
 
     def __init__(self, **kwargs):
@@ -69,8 +89,19 @@ class AppGUI(App):
 
         self.title = "CRC Encrypt"
 
+        # Check if encryption will run without AES-NI, which is shown once the
+        # GUI starts, and generate RSA keys while the user is busy with the GUI
+        log.info(f"OpenSSL: {openssl_version()}")
+        self.aes_ni = check_aes_ni()
+        start_key_pool()
+
         self.key_names = get_key_names()
 
+        # A single long lived worker, as submit buttons only allow one job
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="crc_encrypt"
+        )
+
         self.popup_msg = ModalView(
             size_hint=(None, None), size=("300dp", "200dp"), auto_dismiss=False
         )
@@ -78,6 +109,10 @@ class AppGUI(App):
             size_hint=(None, None), size=("300dp", "200dp"), auto_dismiss=False
         )
 
+        # Build each popup's layout once, only the message changes afterwards
+        self.popup_msg_rst = self.build_popup(self.popup_msg)
+        self.popup_err_rst = self.build_popup(self.popup_err)
+
         self.encrypt_tab = EncryptTab(self.key_names, self.encrypt)
         self.decrypt_tab = DecryptTab(self.key_names, self.decrypt)
         self.generate_tab = GenerateTab(self.generate)
@@ -87,6 +122,23 @@ class AppGUI(App):
         self.export_tab = ExportTab(self.key_names, self.export_key)
         self.export_all_tab = ExportAllTab(self.export_all_keys)
 
+        self.tabs = (
+            self.encrypt_tab,
+            self.decrypt_tab,
+            self.generate_tab,
+            self.db_backup_tab,
+            self.db_restore_tab,
+            self.import_tab,
+            self.export_tab,
+            self.export_all_tab,
+        )
+        self.key_tabs = (
+            self.encrypt_tab,
+            self.decrypt_tab,
+            self.db_backup_tab,
+            self.export_tab,
+        )
+
     def encrypt(self, _instance):
         """Encrypt a file or folder using a separate thread.
 
@@ -143,6 +195,9 @@ class AppGUI(App):
             "Failed to generate asymmetric keys",
             "Generating asymmetric key pair",
             clean="",
+            on_success=partial(
+                self.add_key_name, self.generate_tab.name_txt.text
+            ),
             key_pair_name=self.generate_tab.name_txt.text,
             hint=self.generate_tab.hint_txt.text,
             password=self.generate_tab.pass_txt.text,
@@ -176,8 +231,10 @@ class AppGUI(App):
             "Failed to restore the database",
             "Restoring the database",
             clean=DB_PATH,
+            on_success=self.replace_db,
             source=self.db_restore_tab.src_txt.text,
             password=self.db_restore_tab.pw_txt.text,
+            replace=False,
         )
 
     def import_key(self, _instance):
@@ -192,6 +249,9 @@ class AppGUI(App):
             "Failed to import key pair",
             "Importing Key Pair",
             clean="",
+            on_success=partial(
+                self.add_key_name, self.import_tab.name_txt.text
+            ),
             key_pair_name=self.import_tab.name_txt.text,
             private_key=self.import_tab.pri_txt.text,
             public_key=self.import_tab.pub_txt.text,
@@ -265,36 +325,33 @@ class AppGUI(App):
         action_bar.add_widget(action_view)
 
         # The window's tab panel
-        tabs = TabbedPanel(do_default_tab=False)
-        tabs.tab_width = "95dp"
-        tabs.add_widget(self.encrypt_tab)
-        tabs.add_widget(self.decrypt_tab)
-        tabs.add_widget(self.generate_tab)
-        tabs.add_widget(self.db_backup_tab)
-        tabs.add_widget(self.db_restore_tab)
-        tabs.add_widget(self.import_tab)
-        tabs.add_widget(self.export_tab)
-        tabs.add_widget(self.export_all_tab)
+        self.tab_panel = LazyTabbedPanel(do_default_tab=False)
+        self.tab_panel.tab_width = "95dp"
+        for tab in self.tabs:
+            self.tab_panel.add_widget(tab)
 
         # Add action bar and tabs to root layout
         root.add_widget(action_bar)
-        root.add_widget(tabs)
-
-        from kivy.core.window import Window
-        from gui.callback import win_resize_cb
-        from functools import partial
+        root.add_widget(self.tab_panel)
 
-        # Window.bind(on_resize=win_resize_cb)
+        # Resize the help splitters along with the window
         Window.bind(on_resize=partial(win_resize_cb, self))
 
         return root
 
-    def init_gui_thread(self, func, keys, err_msg, msg, clean, **kwargs):
-        """Initialize a thread to perform asynchronous processing.
+    def on_start(self):
+        """Warns the end user once the GUI starts if AES-NI is disabled."""
+        if not self.aes_ni.success:
+            self.launch_popup("Warning", self.aes_ni.msg, error=True)
 
-        The thread will run a given function asynchronously to prevent the main
-        GUI thread from blocking. Further thread based operations are not
-        allowed as the submit buttons are temporarily disabled.
+    def init_gui_thread(
+        self, func, keys, err_msg, msg, clean, on_success=None, **kwargs
+    ):
+        """Submit a job to the executor to perform asynchronous processing.
+
+        The executor will run a given function asynchronously to prevent the
+        main GUI thread from blocking. Further thread based operations are not
+        allowed as the submit buttons are disabled until the job completes.
 
         Args:
             func (function): The function to run on a separate thread.
@@ -302,24 +359,32 @@ class AppGUI(App):
             err_msg (str): An error message in case on any exceptions.
             msg (str): A general message to present to the user.
             clean (str): Temporary directory to be removed.
+            on_success (Optional[function]): Called on the GUI thread if the
+                function succeeds.
             kwargs (str): All of the functions arguments as keyword arguments.
         """
 
         # Extract and validate the required args from the keyword args
-        required = {kwarg: kwargs[kwarg] for kwarg in kwargs if kwarg in keys}
-        valid = validate_required(**required)
+        valid = validate_required(**{key: kwargs[key] for key in keys})
+        if not valid.success:
+            self.launch_popup("Error", valid.msg, error=True)
+            return
 
-        if valid.success:
+        # Disable submit buttons temporarily
+        self.disable_submits()
 
-            # Disable submit buttons temporarily
-            self.disable_submits()
+        # Submit the job and finish it on the GUI thread once it completes
+        future = self.executor.submit(gui_thread, func, err_msg, **kwargs)
+        future.add_done_callback(
+            lambda _future: Clock.schedule_once(
+                lambda _dt: self.finish_gui_thread(_future, on_success)
+            )
+        )
 
-            # Launch the thread
-            args = (self, func, err_msg, clean)
-            Thread(target=gui_thread, args=args, kwargs=kwargs).start()
-        else:
-            self.launch_popup("Error", valid.msg, error=True)
-            return
+        # Cleanup temporary storage after the submit buttons are enabled. The
+        # single worker still finishes it before running the next job.
+        if clean:
+            self.executor.submit(cleanup, clean)
 
         self.launch_popup("Info", msg)
 
@@ -335,12 +400,28 @@ class AppGUI(App):
             error (bool): True if the popup is for an error, defaults to False.
         """
 
-        # Initialize the message as a reST document
-        rst = RstDocument(
-            text=INFO_TXT.format(title=title, msg=msg),
-            scroll_type=["bars", "content"],
-            bar_width="12dp",
-        )
+        # Handle error messages and informative messages separately
+        if error:
+            popup, rst = self.popup_err, self.popup_err_rst
+        else:
+            popup, rst = self.popup_msg, self.popup_msg_rst
+
+        # Show the message as a reST document scrolled to the top
+        rst.text = INFO_TXT.format(title=title, msg=msg)
+        rst.scroll_y = 1
+        popup.open()
+
+    @staticmethod
+    def build_popup(popup):
+        """Builds the layout of a message popup.
+
+        Args:
+            popup (ModalView): The popup that will show messages.
+
+        Returns:
+            RstDocument: The reST document that shows the popup's message.
+        """
+        rst = RstDocument(scroll_type=["bars", "content"], bar_width="12dp")
 
         # Set the layout for the popup including a close button
         main_layout = BoxLayout(orientation="vertical")
@@ -348,48 +429,84 @@ class AppGUI(App):
         sub_layout.size_hint_y = None
         sub_layout.height = "40dp"
         button = Button(text="Close")
+        button.bind(on_release=popup.dismiss)
         sub_layout.add_widget(button)
         main_layout.add_widget(rst)
         main_layout.add_widget(sub_layout)
+        popup.add_widget(main_layout)
 
-        # Handle error messages and informative messages separately
-        if error:
-            button.bind(on_release=self.popup_err.dismiss)
-            self.popup_err.clear_widgets()
-            self.popup_err.add_widget(main_layout)
-            self.popup_err.open()
-        else:
-            button.bind(on_release=self.popup_msg.dismiss)
-            self.popup_msg.clear_widgets()
-            self.popup_msg.add_widget(main_layout)
-            self.popup_msg.open()
+        return rst
 
     def disable_submits(self):
         """Disables submit buttons when threaded processing begins."""
-        self.encrypt_tab.sub_btn.disabled = True
-        self.decrypt_tab.sub_btn.disabled = True
-        self.generate_tab.sub_btn.disabled = True
-        self.db_backup_tab.sub_btn.disabled = True
-        self.db_restore_tab.sub_btn.disabled = True
-        self.import_tab.sub_btn.disabled = True
-        self.export_tab.sub_btn.disabled = True
-        self.export_all_tab.sub_btn.disabled = True
+        for tab in self.tabs:
+            tab.sub_btn.disabled = True
 
     def enable_submits(self):
         """Enables submit buttons when threaded processing terminates."""
-        self.encrypt_tab.sub_btn.disabled = False
-        self.decrypt_tab.sub_btn.disabled = False
-        self.generate_tab.sub_btn.disabled = False
-        self.db_backup_tab.sub_btn.disabled = False
-        self.db_restore_tab.sub_btn.disabled = False
-        self.import_tab.sub_btn.disabled = False
-        self.export_tab.sub_btn.disabled = False
-        self.export_all_tab.sub_btn.disabled = False
+        for tab in self.tabs:
+            tab.sub_btn.disabled = False
+
+    def finish_gui_thread(self, future, on_success):
+        """Wraps up a job once the executor has run it.
+
+        Every change to the GUI from the job is made here, within a single
+        callback on the GUI thread.
+
+        Args:
+            future (Future): The completed job.
+            on_success (Optional[function]): Called if the job succeeded.
+        """
+        self.enable_submits()
+
+        # Errors are normally caught by gui_thread, but any that escape it are
+        # still shown to the end user
+        error = future.exception()
+        result = Result(False, str(error)) if error else future.result()
+
+        # Check if a message needs to be shown to the end user
+        if not result.success:
+            self.launch_popup("Error", result.msg, error=True)
+            self.popup_msg.dismiss()
+        elif result.msg:
+            self.launch_popup("Warning", result.msg, error=True)
+            self.popup_msg.dismiss()
+
+        if on_success and result.success:
+            on_success()
+
+    def add_key_name(self, name):
+        """Adds a new key pair name to the GUI's drop down menus.
+
+        Key pair names are listed newest first, so the name is added to the
+        front without querying the DB.
+
+        Args:
+            name (str): The name of the new key pair.
+        """
+        self.key_names.insert(0, name)
+        self.sync_drop_downs()
+
+    def replace_db(self):
+        """Replaces the DB file with a restored backup.
+
+        Connections are kept per thread. The restore closes the executor's
+        connection, and this closes the GUI thread's connection before the
+        file is replaced.
+        """
+        db_replace(DB_RESTORE_FILE_PATH)
+        self.update_drop_downs()
 
     def update_drop_downs(self):
-        """Syncs the GUI's drop down menus with the latest key name values."""
+        """Reloads the GUI's drop down menus with key names from the DB."""
         self.key_names = get_key_names()
-        self.encrypt_tab.spinner.values = self.key_names
-        self.decrypt_tab.spinner.values = self.key_names
-        self.db_backup_tab.spinner.values = self.key_names
-        self.export_tab.spinner.values = self.key_names
+        self.sync_drop_downs()
+
+    def sync_drop_downs(self):
+        """Syncs the GUI's drop down menus with the key_names attribute."""
+        for tab in self.key_tabs:
+            tab.key_names = self.key_names
+
+            # Tabs that have not been selected yet have no spinner
+            if tab.spinner is not None:
+                tab.spinner.values = self.key_names
@@ -1,6 +1,6 @@
 """GUI call back functions and related helper functions."""
 
-from functools import partial
+import os
 from pathlib import Path
 
 from kivy.uix.boxlayout import BoxLayout
@@ -12,7 +12,13 @@ from kivy.uix.popup import Popup
 from kivy.utils import platform
 
 from config import HELP_TXT, RESIZE_LIMIT
-from gui.table import ArchiveRecycleView, KeysRecycleView
+from gui.table import ArchiveRecycleView, KeysRecycleView, TableLayout
+
+# Popups are built once and reused each time they are opened
+_file_popup = None
+_file_target = None
+_help_popup = None
+_table_popups = {}
 
 
 def archives_cb(_caller):
@@ -24,9 +30,7 @@ def archives_cb(_caller):
     Args:
         _caller (Widget): Widget that triggered this function.
     """
-    popup = Popup(title="Archive Metadata", auto_dismiss=False)
-    build_table_layout(ArchiveRecycleView(), popup)
-    popup.open()
+    open_table_popup("Archive Metadata", TableLayout(ArchiveRecycleView()))
 
 
 def build_table_layout(table, popup):
@@ -36,7 +40,7 @@ def build_table_layout(table, popup):
     window.
 
     Args:
-        table (Union[ArchiveRecycleView, KeysRecycleView]): The table object.
+        table (TableLayout): The table object.
         popup (Popup): Popup window that will show the table.
     """
 
@@ -54,8 +58,10 @@ def build_table_layout(table, popup):
     sub_layout.add_widget(button)
     main_layout.add_widget(sub_layout)
 
-    # Set the close button to dismiss the popup
+    # Set the close button to dismiss the popup, which stops loading the
+    # table currently shown
     button.bind(on_press=popup.dismiss)
+    popup.bind(on_dismiss=stop_table_cb)
     popup.content = main_layout
 
 
@@ -69,24 +75,51 @@ def file_cb(input_text, _instance):
         input_text (TextInput): Populated by the selection.
         _instance (Widget): Required Kivy bind parameter.
     """
+    global _file_popup, _file_target
+
+    # Reuse the configured popup so the user stays in the same directory. The
+    # directory is scanned again as files may have been created since it was
+    # last open, such as encrypted archives or exported keys. Only the
+    # input_text populated by the "Select" button changes.
+    if _file_popup is not None:
+        popup, file_choose = _file_popup
+        file_choose.selection = []
+
+        # The chooser only scans when its path changes, so the path is set to
+        # the same directory spelt differently before it is set back
+        path = file_choose.path
+        file_choose.path = os.path.join(path, os.curdir)
+        file_choose.path = path
+    else:
+        popup, file_choose = _file_popup = build_file_popup()
+
+    _file_target = input_text
+    popup.open()
+
 
-    # Initialize a file chooser in the user's home directory
-    file_choose = FileChooserIconView()
+def build_file_popup():
+    """Builds the popup used to select a file or directory.
+
+    The file chooser is configured before its first directory scan, which
+    Kivy triggers when the chooser is created with its starting path.
+
+    Returns:
+        tuple: The popup and its file chooser.
+    """
 
     # Set the initial directory based on the platform
     if platform == "android":
-        file_choose.path = "/storage/emulated/0"
+        path = "/storage/emulated/0"
     else:
-        file_choose.path = str(Path.home())
+        path = str(Path.home())
 
     # Allow directory selection and configure the file chooser's scrolling
-    file_choose.dirselect = True
+    file_choose = FileChooserIconView(path=path, dirselect=True)
     file_choose.layout.ids.scrollview.scroll_type = ["bars", "content"]
     file_choose.layout.ids.scrollview.bar_width = "12dp"
-    file_choose.bind()
 
     # Set the layout for the popup window including a "Select" button. This
-    # button is bound to another function to process the file chooser value
+    # button populates whichever input_text file_cb was last called with
     main_layout = BoxLayout(orientation="vertical")
     main_layout.add_widget(file_choose)
     sub_layout = BoxLayout(orientation="horizontal")
@@ -98,29 +131,28 @@ def file_cb(input_text, _instance):
     sub_layout.add_widget(cancel)
     main_layout.add_widget(sub_layout)
 
-    # Initialize and open the popup that presents the file chooser
+    # Initialize the popup that presents the file chooser
     popup = Popup(title="File Chooser", auto_dismiss=False)
-    select.bind(
-        on_release=partial(file_result_cb, file_choose, popup, input_text)
-    )
     cancel.bind(on_release=popup.dismiss)
+    select.fbind("on_release", file_result_cb, file_choose, popup)
     popup.content = main_layout
-    popup.open()
+
+    return popup, file_choose
 
 
-def file_result_cb(file_chooser, popup, input_text, _instance):
+def file_result_cb(file_chooser, popup, _instance):
     """Callback function to set an input_text value from a file_chooser.
 
-    The input_text value is only set if a selection is made by the user.
+    The input_text given to file_cb is only set if a selection is made by the
+    user.
 
     Args:
         file_chooser (FileChooserIconView): File chooser.
         popup (Popup): Popup that closes upon value selection.
-        input_text (TextInput): Populated by the selection.
         _instance (Widget): Required Kivy bind parameter.
     """
     if len(file_chooser.selection) > 0:
-        input_text.text = file_chooser.selection[0]
+        _file_target.text = file_chooser.selection[0]
     popup.dismiss()
 
 
@@ -132,6 +164,12 @@ def help_cb(_caller):
     Args:
         _caller (Widget): Widget that triggered this function.
     """
+    global _help_popup
+
+    # The help information never changes, so only build the popup once
+    if _help_popup is not None:
+        _help_popup.open()
+        return
 
     # Establish the help layout
     main_layout = BoxLayout(orientation="vertical")
@@ -158,6 +196,7 @@ def help_cb(_caller):
     button.bind(on_release=popup.dismiss)
     popup.add_widget(main_layout)
     popup.open()
+    _help_popup = popup
 
 
 def key_pairs_cb(_caller):
@@ -169,16 +208,53 @@ def key_pairs_cb(_caller):
     Args:
         _caller (Widget): Widget that triggered this function.
     """
-    popup = Popup(title="Key Pair Metadata", auto_dismiss=False)
-    build_table_layout(KeysRecycleView(), popup)
+    open_table_popup("Key Pair Metadata", TableLayout(KeysRecycleView()))
+
+
+def open_table_popup(title, table):
+    """Presents a table in a full screen popup.
+
+    The popup and its layout are built the first time a title is shown. After
+    that only the table, which holds the latest data, is replaced.
+
+    Args:
+        title (str): The title of the popup.
+        table (TableLayout): The table object.
+    """
+    popup = _table_popups.get(title)
+
+    if popup is None:
+        popup = Popup(title=title, auto_dismiss=False)
+        build_table_layout(table, popup)
+        _table_popups[title] = popup
+    else:
+        # Replace the previous table, which sits above the close button
+        main_layout = popup.content
+        old_table = main_layout.children[-1]
+        old_table.table.stop_loading()
+        main_layout.remove_widget(old_table)
+        main_layout.add_widget(table, index=len(main_layout.children))
+
     popup.open()
 
 
+def stop_table_cb(popup):
+    """Call back function for a table popup being dismissed.
+
+    Stops loading the rows of the table shown by the popup so that its
+    database cursor is not left open.
+
+    Args:
+        popup (Popup): The dismissed popup.
+    """
+    popup.content.children[-1].table.stop_loading()
+
+
 def win_resize_cb(app, _window, _width, height):
     """Adjusts splitter height when the Kivy window size changes.
 
-    Upon a window resize event each tab's help information splitter height is
-    altered to match the window height.
+    Upon a window resize event the help information splitter shared by the
+    tabs is altered to match the window height.
 
     Args:
         app (AppGUI): The GUI application.
@@ -187,11 +263,4 @@ def win_resize_cb(app, _window, _width, height):
         height (int): The height of the GUI window.
     """
     if height > RESIZE_LIMIT:
-        app.encrypt_tab.splitter.height = height
-        app.decrypt_tab.splitter.height = height
-        app.generate_tab.splitter.height = height
-        app.db_backup_tab.splitter.height = height
-        app.db_restore_tab.splitter.height = height
-        app.import_tab.splitter.height = height
-        app.export_tab.splitter.height = height
-        app.export_all_tab.splitter.height = height
+        app.tab_panel.splitter.height = height
@@ -0,0 +1,25 @@
+"""Widget sizes shared by the GUI.
+
+Sizes are converted from density independent pixels once at import rather
+than parsed from strings such as "32dp" for every widget.
+"""
+
+from kivy.metrics import dp
+
+#: Width of scroll bars
+BAR_WIDTH = dp(12)
+
+#: Height of form and table rows
+ROW_HEIGHT = dp(32)
+
+#: Height of buttons within form rows
+BUTTON_HEIGHT = dp(30)
+
+#: Height of each tab's form layout
+FORM_HEIGHT = dp(340)
+
+#: Padding around each tab's form
+FORM_PADDING = dp(15)
+
+#: Spacing between the rows of each tab's form
+FORM_SPACING = dp(25)
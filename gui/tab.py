@@ -4,10 +4,11 @@ of the tab content and a horizontally split help section. The help section is
 populated using GUI function docstrings.
 """
 
-from kivy.uix.boxlayout import BoxLayout
+from kivy.clock import Clock
 from kivy.uix.gridlayout import GridLayout
+from kivy.uix.rst import RstDocument
 from kivy.uix.scrollview import ScrollView
-from kivy.uix.tabbedpanel import TabbedPanelItem
+from kivy.uix.tabbedpanel import TabbedPanel, TabbedPanelItem
 
 import gui.app
 from config import (
@@ -19,7 +20,9 @@ from config import (
     EXPORT_HELP,
     GENERATE_HELP,
     IMPORT_HELP,
+    TAB_RELEASE_DELAY,
 )
+from gui.metrics import BAR_WIDTH, FORM_HEIGHT, FORM_PADDING, FORM_SPACING
 from gui.widget import (
     DisabledText,
     FileRow,
@@ -33,7 +36,157 @@ from gui.widget import (
 )
 
 
-class DatabaseBackupTab(TabbedPanelItem):
+class LazyTab(TabbedPanelItem):
+    """Extension of a Kivy TabbedPanelItem that builds its layout on demand.
+
+    Most sessions only use a couple of tabs, so building every tab's layout
+    and reST help document at start up wastes time. Subclasses create the
+    input widgets the GUI reads from up front and the rest, including key pair
+    spinners and their drop downs, in build_layout. This is called the first
+    time the tab is selected. Once a tab has been hidden for a while its form
+    is released again, keeping the input widgets so that nothing the user
+    entered is lost, and the help document as it never changes.
+
+    Args:
+        kwargs: Any additional keyword arguments.
+
+    Attributes:
+        help_text (str): The reST help message shown in the splitter.
+        help_doc (Optional[RstDocument]): The help document once built.
+        main_layout (Optional[GridLayout]): The layout that holds the shared
+            help splitter beside the form once built.
+        form_layout (Optional[GridLayout]): The layout of the form's rows
+            once built.
+        release (ClockEvent): Trigger that releases the layout after the tab
+            has been hidden for TAB_RELEASE_DELAY seconds.
+    """
+
+    help_text = ""
+
+    def __init__(self, **kwargs):
+        super(LazyTab, self).__init__(**kwargs)
+
+        self.help_doc = None
+        self.main_layout = None
+        self.form_layout = None
+        self.release = Clock.create_trigger(
+            self.release_layout, TAB_RELEASE_DELAY
+        )
+
+    def build_layout(self):
+        """Builds the tab's form layout and, the first time, help document.
+
+        Every tab shares this layout, only the rows of the form and the help
+        message differ. The help splitter is added by the LazyTabbedPanel.
+        """
+        rows = self.build_rows()
+        scroll_layout = ScrollView(scroll_type=["bars"], bar_width=BAR_WIDTH)
+        main_layout = GridLayout(cols=2, size_hint_y=None, height=FORM_HEIGHT)
+        tab_layout = GridLayout(
+            rows=len(rows), padding=FORM_PADDING, spacing=FORM_SPACING
+        )
+
+        # Rows have a fixed height, so they stay at the top without a filler
+        for row in rows:
+            tab_layout.add_widget(row)
+
+        # Rendering reST is the slowest part, so the document is built once
+        if self.help_doc is None:
+            self.help_doc = RstDocument(text=self.help_text)
+        self.main_layout = main_layout
+        self.form_layout = tab_layout
+        main_layout.add_widget(tab_layout)
+        scroll_layout.add_widget(main_layout)
+        self.add_widget(scroll_layout)
+
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        raise NotImplementedError
+
+    def release_layout(self, _dt):
+        """Releases the tab's form layout while it is hidden.
+
+        The input widgets are detached from their rows so that the rest of
+        the layout can be freed, and so that build_layout can place them in
+        new rows the next time the tab is selected.
+
+        Args:
+            _dt (float): Required parameter for Kivy's Clock.
+        """
+        if self.main_layout is None or self.state == "down":
+            return
+
+        for row in self.form_layout.children:
+            row.clear_widgets()
+        self.remove_widget(self.content)
+
+        self.main_layout = None
+        self.form_layout = None
+
+
+class LazyTabbedPanel(TabbedPanel):
+    """Extension of a Kivy TabbedPanel that builds lazy tabs when selected.
+
+    Only one tab is visible at a time, so a single help splitter is moved into
+    whichever tab is selected. The tab being hidden releases its layout unless
+    it is selected again soon after.
+
+    Args:
+        kwargs: Any additional keyword arguments.
+
+    Attributes:
+        splitter (SplitterCustom): The help splitter shared by every tab.
+    """
+
+    def __init__(self, **kwargs):
+        self.splitter = SplitterCustom()
+
+        super(LazyTabbedPanel, self).__init__(**kwargs)
+
+    def clear_widgets(self, *args, **kwargs):
+        """Removes the shown tab content before another tab's is shown.
+
+        Kivy's TabbedPanel keeps a reference to every content widget it has
+        shown, which stops released tab layouts from being freed.
+
+        Args:
+            args: Any additional positional arguments.
+            kwargs: Any additional keyword arguments.
+        """
+        super(LazyTabbedPanel, self).clear_widgets(*args, **kwargs)
+        self._childrens.clear()
+
+    def switch_to(self, header, *args, **kwargs):
+        """Builds the layout of a lazy tab and moves the splitter into it.
+
+        Args:
+            header (TabbedPanelHeader): The tab to switch to.
+            args: Any additional positional arguments.
+            kwargs: Any additional keyword arguments.
+        """
+        previous = self.current_tab
+        if isinstance(previous, LazyTab) and previous is not header:
+            previous.release()
+
+        if isinstance(header, LazyTab):
+            header.release.cancel()
+            if header.main_layout is None:
+                header.build_layout()
+
+            # Place the splitter before the form, in the first column
+            if self.splitter.parent is not None:
+                self.splitter.parent.remove_widget(self.splitter)
+            self.splitter.show_help(header.help_doc)
+            header.main_layout.add_widget(self.splitter, index=1)
+
+        super(LazyTabbedPanel, self).switch_to(header, *args, **kwargs)
+
+
+class DatabaseBackupTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to backup the database.
 
     Args:
@@ -43,40 +196,40 @@ class DatabaseBackupTab(TabbedPanelItem):
 
     Attributes:
         text (str): The title of the tab.
-        spinner (SpinnerCustom): Selection of key pairs available.
+        key_names (list[str]): The key pair names for the spinner.
+        spinner (Optional[SpinnerCustom]): Selection of key pairs available,
+            created along with the layout.
         dst_txt (DisabledText): The destination picked by the user.
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = DB_BACKUP_HELP
+
     def __init__(self, key_names, func, **kwargs):
         super(DatabaseBackupTab, self).__init__(**kwargs)
 
         self.text = "DB Backup"
-        self.spinner = SpinnerCustom(key_names)
+        self.key_names = key_names
+        self.spinner = None
         self.dst_txt = DisabledText()
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=4, padding="15dp", spacing="25dp")
-
-        name_row = SpinnerRow("*Key Pair Name", self.spinner)
-        dst_row = FileRow("*Destination", self.dst_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(dst_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(DB_BACKUP_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        if self.spinner is None:
+            self.spinner = SpinnerCustom(self.key_names)
+        return [
+            SpinnerRow("*Key Pair Name", self.spinner),
+            FileRow("*Destination", self.dst_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class DatabaseRestoreTab(TabbedPanelItem):
+class DatabaseRestoreTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to restore the DB from a backup.
 
     Args:
@@ -90,6 +243,8 @@ class DatabaseRestoreTab(TabbedPanelItem):
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = DB_RESTORE_HELP
+
     def __init__(self, func, **kwargs):
         super(DatabaseRestoreTab, self).__init__(**kwargs)
 
@@ -98,27 +253,20 @@ class DatabaseRestoreTab(TabbedPanelItem):
         self.pw_txt = FreeText(pw=True)
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=4, padding="15dp", spacing="25dp")
-
-        src_row = FileRow("*Source", self.src_txt)
-        pw_row = FreeTextRow("*Password", self.pw_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(src_row)
-        tab_layout.add_widget(pw_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(DB_RESTORE_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        return [
+            FileRow("*Source", self.src_txt),
+            FreeTextRow("*Password", self.pw_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class DecryptTab(TabbedPanelItem):
+class DecryptTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to present a form for decryption.
 
     Args:
@@ -128,48 +276,46 @@ class DecryptTab(TabbedPanelItem):
 
     Attributes:
         text (str): The title of the tab.
-        spinner (SpinnerCustom): Selection of key pairs available.
+        key_names (list[str]): The key pair names for the spinner.
+        spinner (Optional[SpinnerCustom]): Selection of key pairs available,
+            created along with the layout.
         src_text (DisabledText): The source picked by the user.
         dst_text (DisabledText): The destination picked by the user.
         pw_txt (FreeText): The password provided by the user.
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = DECRYPT_HELP
+
     def __init__(self, key_names, func, **kwargs):
         super(DecryptTab, self).__init__(**kwargs)
 
         self.text = "Decrypt"
-        self.spinner = SpinnerCustom(key_names)
+        self.key_names = key_names
+        self.spinner = None
         self.src_txt = DisabledText()
         self.dst_txt = DisabledText()
         self.pw_txt = FreeText(pw=True)
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=6, padding="15dp", spacing="25dp")
-
-        name_row = SpinnerRow("*Key Pair Name", self.spinner)
-        src_row = FileRow("*Source", self.src_txt)
-        dst_row = FileRow("*Destination", self.dst_txt)
-        pw_row = FreeTextRow("Password", self.pw_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(src_row)
-        tab_layout.add_widget(dst_row)
-        tab_layout.add_widget(pw_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(DECRYPT_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        if self.spinner is None:
+            self.spinner = SpinnerCustom(self.key_names)
+        return [
+            SpinnerRow("*Key Pair Name", self.spinner),
+            FileRow("*Source", self.src_txt),
+            FileRow("*Destination", self.dst_txt),
+            FreeTextRow("Password", self.pw_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class EncryptTab(TabbedPanelItem):
+class EncryptTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to present a form for encryption.
 
     Args:
@@ -181,42 +327,41 @@ class EncryptTab(TabbedPanelItem):
         text (str): The title of the tab.
         src_text (DisabledText): The source picked by the user.
         dst_text (DisabledText): The destination picked by the user.
-        spinner (SpinnerCustom): Selection of key pairs available.
+        key_names (list[str]): The key pair names for the spinner.
+        spinner (Optional[SpinnerCustom]): Selection of key pairs available,
+            created along with the layout.
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = ENCRYPT_HELP
+
     def __init__(self, key_names, func, **kwargs):
         super(EncryptTab, self).__init__(**kwargs)
 
         self.text = "Encrypt"
         self.src_txt = DisabledText()
         self.dst_txt = DisabledText()
-        self.spinner = SpinnerCustom(key_names)
+        self.key_names = key_names
+        self.spinner = None
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=5, padding="15dp", spacing="25dp")
-
-        name_row = SpinnerRow("*Key Pair Name", self.spinner)
-        src_row = FileRow("*Source", self.src_txt)
-        dst_row = FileRow("*Destination", self.dst_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(src_row)
-        tab_layout.add_widget(dst_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(ENCRYPT_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        if self.spinner is None:
+            self.spinner = SpinnerCustom(self.key_names)
+        return [
+            SpinnerRow("*Key Pair Name", self.spinner),
+            FileRow("*Source", self.src_txt),
+            FileRow("*Destination", self.dst_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class ExportAllTab(TabbedPanelItem):
+class ExportAllTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to export all key pairs.
 
     Args:
@@ -229,6 +374,8 @@ class ExportAllTab(TabbedPanelItem):
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = EXPORT_ALL_HELP
+
     def __init__(self, func, **kwargs):
         super(ExportAllTab, self).__init__(**kwargs)
 
@@ -236,25 +383,19 @@ class ExportAllTab(TabbedPanelItem):
         self.dst_txt = DisabledText()
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=3, padding="15dp", spacing="25dp")
-
-        dst_row = FileRow("*Destination", self.dst_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(dst_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
 
-        self.splitter = SplitterCustom(EXPORT_ALL_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        return [
+            FileRow("*Destination", self.dst_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class ExportTab(TabbedPanelItem):
+class ExportTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to present a form to export keys.
 
     Args:
@@ -264,40 +405,40 @@ class ExportTab(TabbedPanelItem):
 
     Attributes:
         text (str): The title of the tab.
-        spinner (SpinnerCustom): Selection of key pairs available.
+        key_names (list[str]): The key pair names for the spinner.
+        spinner (Optional[SpinnerCustom]): Selection of key pairs available,
+            created along with the layout.
         dst_text (DisabledText): The destination picked by the user.
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = EXPORT_HELP
+
     def __init__(self, key_names, func, **kwargs):
         super(ExportTab, self).__init__(**kwargs)
 
         self.text = "Export"
-        self.spinner = SpinnerCustom(key_names)
+        self.key_names = key_names
+        self.spinner = None
         self.dst_txt = DisabledText()
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=4, padding="15dp", spacing="25dp")
-
-        name_row = SpinnerRow("*Key Pair Name", self.spinner)
-        dst_row = FileRow("*Destination", self.dst_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(dst_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(EXPORT_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        if self.spinner is None:
+            self.spinner = SpinnerCustom(self.key_names)
+        return [
+            SpinnerRow("*Key Pair Name", self.spinner),
+            FileRow("*Destination", self.dst_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class GenerateTab(TabbedPanelItem):
+class GenerateTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to facilitate generating keys.
 
     Args:
@@ -313,6 +454,8 @@ class GenerateTab(TabbedPanelItem):
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = GENERATE_HELP
+
     def __init__(self, func, **kwargs):
         super(GenerateTab, self).__init__(**kwargs)
 
@@ -323,31 +466,22 @@ class GenerateTab(TabbedPanelItem):
         self.conf_txt = FreeText(pw=True)
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=6, padding="15dp", spacing="25dp")
-
-        name_row = FreeTextRow("*Key Pair Name", self.name_txt)
-        hint_row = FreeTextRow("Password Hint", self.hint_txt)
-        pw_row = FreeTextRow("Password", self.pass_txt)
-        conf_row = FreeTextRow("Confirm Password", self.conf_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(hint_row)
-        tab_layout.add_widget(pw_row)
-        tab_layout.add_widget(conf_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(GENERATE_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        return [
+            FreeTextRow("*Key Pair Name", self.name_txt),
+            FreeTextRow("Password Hint", self.hint_txt),
+            FreeTextRow("Password", self.pass_txt),
+            FreeTextRow("Confirm Password", self.conf_txt),
+            SubmitRow(self.sub_btn),
+        ]
 
 
-class ImportTab(TabbedPanelItem):
+class ImportTab(LazyTab):
     """Extension of a Kivy TabbedPanelItem to present a form to import keys.
 
     Args:
@@ -364,6 +498,8 @@ class ImportTab(TabbedPanelItem):
         sub_btn (SubmitButton): The submit button for this tab.
     """
 
+    help_text = IMPORT_HELP
+
     def __init__(self, func, **kwargs):
         super(ImportTab, self).__init__(**kwargs)
 
@@ -375,27 +511,17 @@ class ImportTab(TabbedPanelItem):
         self.pass_txt = FreeText(pw=True)
         self.sub_btn = SubmitButton(func)
 
-        scroll_layout = ScrollView(scroll_type=["bars"], bar_width="12dp")
-        main_layout = GridLayout(cols=2, size_hint_y=None, height="340dp")
-        tab_layout = GridLayout(rows=7, padding="15dp", spacing="25dp")
-
-        name_row = FreeTextRow("*Key Pair Name", self.name_txt)
-        pri_row = FileRow("*Private Key", self.pri_txt)
-        pub_row = FileRow("*Public Key", self.pub_txt)
-        hint_row = FreeTextRow("Password Hint", self.hint_txt)
-        pw_row = FreeTextRow("Password", self.pass_txt)
-        sub_row = SubmitRow(self.sub_btn)
-        fil_row = BoxLayout(orientation="horizontal")
-        tab_layout.add_widget(name_row)
-        tab_layout.add_widget(pri_row)
-        tab_layout.add_widget(pub_row)
-        tab_layout.add_widget(hint_row)
-        tab_layout.add_widget(pw_row)
-        tab_layout.add_widget(sub_row)
-        tab_layout.add_widget(fil_row)
-
-        self.splitter = SplitterCustom(IMPORT_HELP)
-        main_layout.add_widget(self.splitter)
-        main_layout.add_widget(tab_layout)
-        scroll_layout.add_widget(main_layout)
-        self.add_widget(scroll_layout)
+    def build_rows(self):
+        """Builds the rows of the tab's form.
+
+        Returns:
+            list[BoxLayout]: The rows in display order.
+        """
+        return [
+            FreeTextRow("*Key Pair Name", self.name_txt),
+            FileRow("*Private Key", self.pri_txt),
+            FileRow("*Public Key", self.pub_txt),
+            FreeTextRow("Password Hint", self.hint_txt),
+            FreeTextRow("Password", self.pass_txt),
+            SubmitRow(self.sub_btn),
+        ]
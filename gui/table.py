@@ -1,67 +1,125 @@
 """GUI Table related functions and classes."""
 
-from kivy.uix.boxlayout import BoxLayout
+from itertools import islice
 
+from kivy.clock import Clock
+from kivy.properties import BooleanProperty, StringProperty
+from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.recycleview import RecycleView
+from kivy.uix.scrollview import ScrollView
 
+from config import TABLE_PAGE_SIZE, TABLE_RESIZE_DELAY
+from gui.metrics import BAR_WIDTH, ROW_HEIGHT
 from utils.helpers import get_archives, get_key_pairs, get_table_width
 
-# Global values for the width of tables. Set globally to avoid recalculation
-ARCH_MAX_WIDTH = 0
-KEYS_MAX_WIDTH = 0
-
-
-class ArchiveRecycleView(RecycleView):
-    """Extension of Kivy's RecycleView to present Archive meta data.
+# Header rows, built once and shared by every table
+ARCH_HEADER = {
+    "name": "Name",
+    "src_path": "Source",
+    "dst_path": "Destination",
+    "kp": "Key Pair Name",
+    "timestamp": "Timestamp",
+}
+KEYS_HEADER = {
+    "name": "Name",
+    "pw": "Has Password",
+    "hint": "Password Hint",
+    "strong": "Strong Password",
+    "timestamp": "Timestamp",
+}
+
+
+class TableRecycleView(RecycleView):
+    """Extension of Kivy's RecycleView to present a table of meta data.
 
     A RecycleView is used as it allows the table data to be handled more
-    efficiently by Kivy.
+    efficiently by Kivy. The rows are loaded a page per frame, so large tables
+    are drawn before every row has been read. The header is not part of the
+    data, it is pinned above the rows by a TableLayout.
 
     Args:
+        viewclass (type): The class that sets the content for this view.
+        header (dict[str, str]): The header row, shown above the rows in bold.
+        rows (Generator[dict[str, str]]): The table's rows, read as needed.
         kwargs: Any additional keyword arguments.
 
     Attributes:
-        viewclass (str): The class that sets the content for this view.
+        viewclass (type): The class that sets the content for this view.
         scroll_type (list[str]): The ways the widget can be scrolled.
         bar_width (int): The width of the displayed scroll bar.
         do_scroll_x (bool): Set to True to allow horizontal scrolling.
         do_scroll_y (bool): Set to True to allow vertical scrolling.
-        size_hint (tuple[int, int]): Set to fill the parent viewport.
+        header (dict[str, str]): The header row, shown above the rows in bold.
+        rows (Generator[dict[str, str]]): The rows that are yet to be loaded.
+        load_event (ClockEvent): Loads a page of rows each frame.
     """
 
-    def __init__(self, **kwargs):
-        super(ArchiveRecycleView, self).__init__(**kwargs)
+    def __init__(self, viewclass, header, rows, **kwargs):
+        super(TableRecycleView, self).__init__(**kwargs)
 
         # Set the RecycleView's widgets and parameters
         self.add_widget(TableRecycleBoxLayout())
-        self.viewclass = "ArchiveTableRow"
+        self.viewclass = viewclass
         self.scroll_type = ["bars", "content"]
-        self.bar_width = "12dp"
+        self.bar_width = BAR_WIDTH
         self.do_scroll_x = True
         self.do_scroll_y = True
-        # self.size_hint = (1, 1)
-
-        # Set the data for the RecycleView with a bold faced header row
-        tmp_data = [
-            {
-                "name": "[b]Name[/b]",
-                "src_path": "[b]Source[/b]",
-                "dst_path": "[b]Destination[/b]",
-                "kp": "[b]Key Pair Name[/b]",
-                "timestamp": "[b]Timestamp[/b]",
-            }
-        ]
-        tmp_data += get_archives()
-        self.data = tmp_data
-
-        # Set the max width for the Archive table data
-        set_max_width(tmp_data)
-
-
-class ArchiveTableRow(BoxLayout):
-    """Represents a single row of Archive meta data using Kivy's BoxLayout.
+
+        # The table is at least as wide as its header
+        self.layout_manager.default_width = get_table_width([header])
+        self.header = header
+
+        # Load the rows once the popup has been drawn so that it opens at once
+        self.rows = rows
+        self.load_event = Clock.schedule_interval(self.load_page, 0)
+
+    def add_rows(self, rows):
+        """Appends rows to the table, widening it if a new row is wider.
+
+        Only the new rows are measured, the rows already in the table are not
+        measured again. The width is set on the layout before the rows so that
+        they are laid out with the final width.
+
+        Args:
+            rows (list[dict[str, str]]): The rows to append.
+        """
+        width = get_table_width(rows)
+        if width > (self.layout_manager.default_width or 0):
+            self.layout_manager.default_width = width
+        self.data.extend(rows)
+
+    def load_page(self, _dt):
+        """Appends the next page of rows to the table.
+
+        Args:
+            _dt (float): Required parameter for Kivy's Clock.
+
+        Returns:
+            bool: False once every row is loaded, which unschedules this.
+        """
+        page = list(islice(self.rows, TABLE_PAGE_SIZE))
+        if page:
+            self.add_rows(page)
+
+        return len(page) == TABLE_PAGE_SIZE
+
+    def stop_loading(self):
+        """Stops loading rows, keeping the rows that are already loaded.
+
+        The rows are read from an open database cursor. Closing them releases
+        the cursor, which would otherwise stop the database from being backed
+        up or restored until every row had been read.
+        """
+        self.load_event.cancel()
+        self.rows.close()
+
+
+class TableRow(BoxLayout):
+    """Base class for a single row of a table using Kivy's BoxLayout.
+
+    Labels in a row do not parse markup, the header row is set in bold.
 
     Args:
         kwargs: Any additional keyword arguments.
@@ -69,23 +127,64 @@ class ArchiveTableRow(BoxLayout):
     Attributes:
         orientation (str): The direction in which widgets are arranged.
         size_hint: Set to None to force the desired sizing.
-        width (int): The overall width of the row.
-        height (int): The overall height of the row.
+        header (bool): True if the row is the table's pinned header.
     """
 
+    header = BooleanProperty(False)
+
     def __init__(self, **kwargs):
-        super(ArchiveTableRow, self).__init__(**kwargs)
 
-        self.orientation = "horizontal"
-        self.size_hint = (None, None)
-        self.width = ARCH_MAX_WIDTH
-        self.height = "32dp"
+        # Pass the sizing to Kivy up front so that the layout is not triggered
+        # again for each property set after construction
+        super(TableRow, self).__init__(
+            orientation="horizontal",
+            size_hint=(None, None),
+            **kwargs,
+        )
+
+
+class ArchiveRecycleView(TableRecycleView):
+    """Extension of a TableRecycleView to present Archive meta data.
+
+    Args:
+        kwargs: Any additional keyword arguments.
+    """
+
+    def __init__(self, **kwargs):
+        super(ArchiveRecycleView, self).__init__(
+            ArchiveTableRow, ARCH_HEADER, get_archives(), **kwargs
+        )
+
+
+class ArchiveTableRow(TableRow):
+    """Represents a single row of Archive meta data using Kivy's BoxLayout.
+
+    Args:
+        kwargs: Any additional keyword arguments.
+
+    Attributes:
+        name (str): The archive's name.
+        src_path (str): The archive's source path.
+        dst_path (str): The archive's destination path.
+        kp (str): The name of the archive's key pair.
+        timestamp (str): When the archive was created.
+    """
+
+    # Set by the RecycleView from each row of data
+    name = StringProperty("")
+    src_path = StringProperty("")
+    dst_path = StringProperty("")
+    kp = StringProperty("")
+    timestamp = StringProperty("")
 
-        self.name_lbl = Label(markup=True, text="")
-        self.src_path_lbl = Label(markup=True, text="")
-        self.dst_path_lbl = Label(markup=True, text="")
-        self.kp_lbl = Label(markup=True, text="")
-        self.timestamp_lbl = Label(markup=True, text="")
+    def __init__(self, **kwargs):
+        super(ArchiveTableRow, self).__init__(**kwargs)
+
+        self.name_lbl = Label(text="")
+        self.src_path_lbl = Label(text="")
+        self.dst_path_lbl = Label(text="")
+        self.kp_lbl = Label(text="")
+        self.timestamp_lbl = Label(text="")
 
         self.add_widget(self.name_lbl)
         self.add_widget(self.src_path_lbl)
@@ -93,93 +192,60 @@ class ArchiveTableRow(BoxLayout):
         self.add_widget(self.kp_lbl)
         self.add_widget(self.timestamp_lbl)
 
-    def on_parent(self, _screen, _parent):
-        """Updates the row values when parent events are fired.
+        # Keep each label in sync with the matching row value
+        self.bind(name=self.name_lbl.setter("text"))
+        self.bind(src_path=self.src_path_lbl.setter("text"))
+        self.bind(dst_path=self.dst_path_lbl.setter("text"))
+        self.bind(kp=self.kp_lbl.setter("text"))
+        self.bind(timestamp=self.timestamp_lbl.setter("text"))
 
-        Args:
-            _screen (Widget): Required for Kivy on_parent.
-            _parent (Widget): Required for Kivy on_parent.
-        """
-        self.name_lbl.text = self.name
-        self.src_path_lbl.text = self.src_path
-        self.dst_path_lbl.text = self.dst_path
-        self.kp_lbl.text = self.kp
-        self.timestamp_lbl.text = self.timestamp
+        # Only the header's labels are bold, rather than parsing markup
+        for label in self.children:
+            self.bind(header=label.setter("bold"))
 
 
-class KeysRecycleView(RecycleView):
-    """Extension of Kivy's RecycleView to present Key Pair meta data.
-
-    A RecycleView is used as it allows the table data to be handled more
-    efficiently by Kivy.
+class KeysRecycleView(TableRecycleView):
+    """Extension of a TableRecycleView to present Key Pair meta data.
 
     Args:
         kwargs: Any additional keyword arguments.
-
-    Attributes:
-        viewclass (str): The class that sets the content for this view.
-        scroll_type (list[str]): The ways the widget can be scrolled.
-        bar_width (int): The width of the displayed scroll bar.
-        do_scroll_x (bool): Set to True to allow horizontal scrolling.
-        do_scroll_y (bool): Set to True to allow vertical scrolling.
-        size_hint (tuple[int, int]): Set to fill the parent viewport.
     """
 
     def __init__(self, **kwargs):
-        super(KeysRecycleView, self).__init__(**kwargs)
+        super(KeysRecycleView, self).__init__(
+            KeysTableRow, KEYS_HEADER, get_key_pairs(), **kwargs
+        )
 
-        # Set the RecycleView's widgets and parameters
-        self.add_widget(TableRecycleBoxLayout())
-        self.viewclass = "KeysTableRow"
-        self.scroll_type = ["bars", "content"]
-        self.bar_width = "12dp"
-        self.do_scroll_x = True
-        self.do_scroll_y = True
-        # self.size_hint = (1, 1)
-
-        # Set the data for the RecycleView with a bold faced header row
-        tmp_data = [
-            {
-                "name": "[b]Name[/b]",
-                "pw": "[b]Has Password[/b]",
-                "hint": "[b]Password Hint[/b]",
-                "strong": "[b]Strong Password[/b]",
-                "timestamp": "[b]Timestamp[/b]",
-            }
-        ]
-        tmp_data += get_key_pairs()
-        self.data = tmp_data
-
-        # Set the max width for the Key Pairs table data
-        set_max_width(tmp_data, keys=True)
-
-
-class KeysTableRow(BoxLayout):
+
+class KeysTableRow(TableRow):
     """Represents a single row of Key Pair meta data using Kivy's BoxLayout.
 
     Args:
         kwargs: Any additional keyword arguments.
 
     Attributes:
-        orientation (str): The direction in which widgets are arranged.
-        size_hint: Set to None to force the desired sizing.
-        width (int): The overall width of the row.
-        height (int): The overall height of the row.
+        name (str): The key pair's name.
+        pw (str): Whether the key pair has a password.
+        hint (str): The key pair's password hint.
+        strong (str): Whether the key pair's password is strong.
+        timestamp (str): When the key pair was created.
     """
 
+    # Set by the RecycleView from each row of data
+    name = StringProperty("")
+    pw = StringProperty("")
+    hint = StringProperty("")
+    strong = StringProperty("")
+    timestamp = StringProperty("")
+
     def __init__(self, **kwargs):
         super(KeysTableRow, self).__init__(**kwargs)
 
-        self.orientation = "horizontal"
-        self.size_hint = (None, None)
-        self.width = KEYS_MAX_WIDTH
-        self.height = "32dp"
-
-        self.name_lbl = Label(markup=True, text="")
-        self.pw_lbl = Label(markup=True, text="")
-        self.hint_lbl = Label(markup=True, text="")
-        self.strong_lbl = Label(markup=True, text="")
-        self.timestamp_lbl = Label(markup=True, text="")
+        self.name_lbl = Label(text="")
+        self.pw_lbl = Label(text="")
+        self.hint_lbl = Label(text="")
+        self.strong_lbl = Label(text="")
+        self.timestamp_lbl = Label(text="")
 
         self.add_widget(self.name_lbl)
         self.add_widget(self.pw_lbl)
@@ -187,18 +253,16 @@ class KeysTableRow(BoxLayout):
         self.add_widget(self.strong_lbl)
         self.add_widget(self.timestamp_lbl)
 
-    def on_parent(self, _screen, _parent):
-        """Updates the row values when parent events are fired.
+        # Keep each label in sync with the matching row value
+        self.bind(name=self.name_lbl.setter("text"))
+        self.bind(pw=self.pw_lbl.setter("text"))
+        self.bind(hint=self.hint_lbl.setter("text"))
+        self.bind(strong=self.strong_lbl.setter("text"))
+        self.bind(timestamp=self.timestamp_lbl.setter("text"))
 
-        Args:
-            _screen (Widget): Required for Kivy on_parent.
-            _parent (Widget): Required for Kivy on_parent.
-        """
-        self.name_lbl.text = self.name
-        self.pw_lbl.text = self.pw
-        self.hint_lbl.text = self.hint
-        self.strong_lbl.text = self.strong
-        self.timestamp_lbl.text = self.timestamp
+        # Only the header's labels are bold, rather than parsing markup
+        for label in self.children:
+            self.bind(header=label.setter("bold"))
 
 
 class TableRecycleBoxLayout(RecycleBoxLayout):
@@ -208,7 +272,8 @@ class TableRecycleBoxLayout(RecycleBoxLayout):
         kwargs: Any additional keyword arguments.
 
     Attributes:
-        default_size: Set to None to force the desired sizing.
+        default_width (int): The width of every row, set by each table.
+        default_height (int): The height of every row.
         default_size_hint: Set to None to force the desired sizing.
         size_hint_y: Set to None to force the desired sizing.
         size_hint_x: Set to None to force the desired sizing.
@@ -216,52 +281,69 @@ class TableRecycleBoxLayout(RecycleBoxLayout):
     """
 
     def __init__(self, **kwargs):
-        super(TableRecycleBoxLayout, self).__init__(**kwargs)
-
-        self.default_size = (None, None)
-        self.default_size_hint = (None, None)
-        self.size_hint_y = None
-        self.size_hint_x = None
-        self.orientation = "vertical"
-
-        # Force the height and width to be equal to the minimum height and
-        # width. Equivalent to kv language of: height: self.minimum_height
-        self.bind(minimum_height=self._min_height)
-        self.bind(minimum_width=self._min_width)
-
-    def _min_height(self, _instance, value):
-        """Method to set the height equal to the minimum height.
-
-        Args:
-            _instance (Widget): Required parameter for Kivy.
-            value (int): The new value for the height.
-        """
-        self.height = value
-
-    def _min_width(self, _instance, value):
-        """Method to set the width equal to the minimum width.
+        super(TableRecycleBoxLayout, self).__init__(
+            default_width=None,
+            default_height=ROW_HEIGHT,
+            default_size_hint=(None, None),
+            size_hint=(None, None),
+            orientation="vertical",
+            **kwargs,
+        )
+
+        # Force the size to be equal to the minimum size. Equivalent to kv
+        # language of: size: self.minimum_size. Changes are coalesced so that
+        # a burst of them, such as a page of new rows, sets the size once.
+        self._resize = Clock.create_trigger(self._min_size, TABLE_RESIZE_DELAY)
+        self.fbind("minimum_size", self._resize)
+
+    def _min_size(self, _dt):
+        """Method to set the size equal to the minimum size.
 
         Args:
-            _instance (Widget): Required parameter for Kivy.
-            value (int): The new value for the width.
+            _dt (float): Required parameter for Kivy's Clock.
         """
-        self.width = value
+        self.size = self.minimum_size
 
 
-def set_max_width(data, keys=False):
-    """Sets the max width of tables displayed using Kivy's RecycleView.
+class TableLayout(BoxLayout):
+    """Layout of a table with its header row pinned above the scrolling rows.
 
-    The max width parameters are stored as global variables to prevent having
-    to set them for each and every row. Instead, they are set once when the
-    RecycleView is instantiated.
+    The header stays in view while the rows scroll vertically and follows the
+    rows when they scroll horizontally.
 
     Args:
-        data (list[dict[str, str]]): The table's data elements.
-        keys (bool): True if key table max width is set, defaults to False.
+        table (TableRecycleView): The table's rows.
+        kwargs: Any additional keyword arguments.
+
+    Attributes:
+        orientation (str): The direction in which widgets are arranged.
+        header_view (ScrollView): Clips the header row to the table's width.
+        table (TableRecycleView): The table's rows.
     """
-    if keys:
-        global KEYS_MAX_WIDTH
-        KEYS_MAX_WIDTH = get_table_width(data)
-    else:
-        global ARCH_MAX_WIDTH
-        ARCH_MAX_WIDTH = get_table_width(data)
+
+    def __init__(self, table, **kwargs):
+        super(TableLayout, self).__init__(orientation="vertical", **kwargs)
+
+        # The header is drawn by the table's own row class so that its columns
+        # line up with the rows below it
+        header = table.viewclass(height=ROW_HEIGHT)
+        header.header = True
+        for key, value in table.header.items():
+            setattr(header, key, value)
+        table.layout_manager.fbind("default_width", header.setter("width"))
+        header.width = table.layout_manager.default_width
+
+        # The header is only scrolled by the table, never by the user
+        self.header_view = ScrollView(
+            size_hint_y=None,
+            height=ROW_HEIGHT,
+            do_scroll_x=False,
+            do_scroll_y=False,
+            bar_width=0,
+        )
+        self.header_view.add_widget(header)
+        table.fbind("scroll_x", self.header_view.setter("scroll_x"))
+
+        self.table = table
+        self.add_widget(self.header_view)
+        self.add_widget(table)
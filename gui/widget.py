@@ -1,19 +1,17 @@
 """Customized extensions of Kivy widgets."""
 
-from functools import partial
-
 from kivy.core.window import Window
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.dropdown import DropDown
 from kivy.uix.label import Label
-from kivy.uix.rst import RstDocument
 from kivy.uix.spinner import Spinner
 from kivy.uix.splitter import Splitter
 from kivy.uix.textinput import TextInput
 from kivy.utils import platform
 
 from gui.callback import file_cb
+from gui.metrics import BUTTON_HEIGHT, ROW_HEIGHT
 
 
 class BrowseButton(Button):
@@ -34,13 +32,15 @@ class BrowseButton(Button):
     """
 
     def __init__(self, text_field, **kwargs):
-        super(BrowseButton, self).__init__(**kwargs)
+        super(BrowseButton, self).__init__(
+            text="Browse",
+            size_hint_x=0.2,
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            **kwargs,
+        )
 
-        self.text = "Browse"
-        self.size_hint_x = 0.2
-        self.size_hint_y = None
-        self.height = "30dp"
-        self.bind(on_press=partial(file_cb, text_field))
+        self.fbind("on_press", file_cb, text_field)
 
 
 class DisabledText(TextInput):
@@ -56,11 +56,9 @@ class DisabledText(TextInput):
     """
 
     def __init__(self, **kwargs):
-        super(DisabledText, self).__init__(**kwargs)
-
-        self.multiline = False
-        self.disabled = True
-        self.size_hint_x = 0.5
+        super(DisabledText, self).__init__(
+            multiline=False, disabled=True, size_hint_x=0.5, **kwargs
+        )
 
 
 class DropDownCustom(DropDown):
@@ -91,11 +89,12 @@ class FileRow(BoxLayout):
     """
 
     def __init__(self, text, text_field, **kwargs):
-        super(FileRow, self).__init__(**kwargs)
-
-        self.orientation = "horizontal"
-        self.size_hint_y = None
-        self.height = "32dp"
+        super(FileRow, self).__init__(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=ROW_HEIGHT,
+            **kwargs,
+        )
 
         self.add_widget(LabelCustom(text=text))
         self.add_widget(text_field)
@@ -117,12 +116,13 @@ class FreeText(TextInput):
     """
 
     def __init__(self, pw=False, **kwargs):
-        super(FreeText, self).__init__(**kwargs)
-
-        self.multiline = False
-        self.password = pw
-        self.size_hint_x = 0.7
-        self.write_tab = False
+        super(FreeText, self).__init__(
+            multiline=False,
+            password=pw,
+            size_hint_x=0.7,
+            write_tab=False,
+            **kwargs,
+        )
 
 
 class FreeTextRow(BoxLayout):
@@ -140,11 +140,12 @@ class FreeTextRow(BoxLayout):
     """
 
     def __init__(self, text, text_field, **kwargs):
-        super(FreeTextRow, self).__init__(**kwargs)
-
-        self.orientation = "horizontal"
-        self.size_hint_y = None
-        self.height = "32dp"
+        super(FreeTextRow, self).__init__(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=ROW_HEIGHT,
+            **kwargs,
+        )
 
         self.add_widget(LabelCustom(text=text))
         self.add_widget(text_field)
@@ -165,13 +166,17 @@ class LabelCustom(Label):
     """
 
     def __init__(self, text, **kwargs):
-        super(LabelCustom, self).__init__(**kwargs)
+        super(LabelCustom, self).__init__(
+            text=text,
+            halign="left",
+            valign="center",
+            size_hint_x=0.3,
+            **kwargs,
+        )
 
-        self.text = text
-        self.halign = "left"
-        self.valign = "center"
-        self.size_hint_x = 0.3
-        self.bind(size=self.setter("text_size"))
+        # Alignment only applies within the text size, which must follow the
+        # label's size as the window is resized
+        self.fbind("size", self.setter("text_size"))
 
 
 class LabelHidden(Label):
@@ -186,10 +191,7 @@ class LabelHidden(Label):
     """
 
     def __init__(self, **kwargs):
-        super(LabelHidden, self).__init__(**kwargs)
-
-        self.text = ""
-        self.size_hint_x = 0.7
+        super(LabelHidden, self).__init__(text="", size_hint_x=0.7, **kwargs)
 
 
 class SpinnerCustom(Spinner):
@@ -210,17 +212,23 @@ class SpinnerCustom(Spinner):
     """
 
     def __init__(self, key_names, **kwargs):
-        super(SpinnerCustom, self).__init__(**kwargs)
 
-        self.dropdown_cls = DropDownCustom
-        self.text_autoupdate = True
-        self.values = key_names
-        self.valign = "middle"
-        self.halign = "center"
-        self.padding_x = "5dp"
-        self.sync_height = True
-        self.size_hint_x = 0.7
-        self.bind(size=self.setter("text_size"))
+        # Kivy builds the drop down and one button per value at the end of its
+        # constructor, then again whenever the drop down class, the values or
+        # text_autoupdate change, so these are passed to Kivy up front
+        super(SpinnerCustom, self).__init__(
+            dropdown_cls=DropDownCustom,
+            text_autoupdate=True,
+            values=key_names,
+            valign="middle",
+            halign="center",
+            padding_x="5dp",
+            sync_height=True,
+            size_hint_x=0.7,
+            **kwargs,
+        )
+
+        self.fbind("size", self.setter("text_size"))
 
 
 class SpinnerRow(BoxLayout):
@@ -238,11 +246,12 @@ class SpinnerRow(BoxLayout):
     """
 
     def __init__(self, text, spinner, **kwargs):
-        super(SpinnerRow, self).__init__(**kwargs)
-
-        self.orientation = "horizontal"
-        self.size_hint_y = None
-        self.height = "32dp"
+        super(SpinnerRow, self).__init__(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=ROW_HEIGHT,
+            **kwargs,
+        )
 
         self.add_widget(LabelCustom(text=text))
         self.add_widget(spinner)
@@ -251,8 +260,10 @@ class SpinnerRow(BoxLayout):
 class SplitterCustom(Splitter):
     """Extension of a Kivy Splitter to split tabs with help information.
 
+    A single splitter is shared by every tab, and it shows the help document
+    of whichever tab is selected.
+
     Args:
-        rest_doc (str): The text that populates the help information.
         kwargs: Any additional keyword arguments.
 
     Attributes:
@@ -265,9 +276,10 @@ class SplitterCustom(Splitter):
         rescale_with_parent (bool): Tries to scale if with the parent window.
         size_hint_y: Set to None to allow for specific height values
         height (int): Set to match the window's height.
+        help_doc (Optional[RstDocument]): The help document being shown.
     """
 
-    def __init__(self, rest_doc, **kwargs):
+    def __init__(self, **kwargs):
         super(SplitterCustom, self).__init__(**kwargs)
 
         self.sizable_from = "right"
@@ -285,7 +297,18 @@ class SplitterCustom(Splitter):
         else:
             self.max_size = "380dp"
 
-        self.add_widget(RstDocument(text=rest_doc))
+        self.help_doc = None
+
+    def show_help(self, help_doc):
+        """Replaces the help document shown by the splitter.
+
+        Args:
+            help_doc (RstDocument): The help document to show.
+        """
+        if self.help_doc is not None:
+            self.remove_widget(self.help_doc)
+        self.help_doc = help_doc
+        self.add_widget(help_doc)
 
 
 class SubmitButton(Button):
@@ -301,10 +324,13 @@ class SubmitButton(Button):
     """
 
     def __init__(self, bind_to, **kwargs):
-        super(SubmitButton, self).__init__(**kwargs)
 
-        self.text = "Submit"
-        self.size_hint_x = 0.3
+        # The default theme's background is already a shared atlas texture, so
+        # only the text and sizing are passed to Kivy up front
+        super(SubmitButton, self).__init__(
+            text="Submit", size_hint_x=0.3, **kwargs
+        )
+
         self.bind(on_press=bind_to)
 
 
@@ -322,11 +348,12 @@ class SubmitRow(BoxLayout):
     """
 
     def __init__(self, button, **kwargs):
-        super(SubmitRow, self).__init__(**kwargs)
-
-        self.orientation = "horizontal"
-        self.size_hint_y = None
-        self.height = "30dp"
+        super(SubmitRow, self).__init__(
+            orientation="horizontal",
+            size_hint_y=None,
+            height=BUTTON_HEIGHT,
+            **kwargs,
+        )
 
         self.add_widget(button)
         self.add_widget(LabelHidden())
@@ -4,6 +4,7 @@ import os
 from shutil import rmtree
 from unittest import TestCase
 
+from config import DB
 from db import Archive, init_db, KeyPair, Password
 
 NAME_1 = "NAME_1"
@@ -27,38 +28,29 @@ class TestSetup(TestCase):
         # Generate a password metadata object
         pw = Password(hint="test", strong=False)
 
-        # Create a key pair, one with a password and one without
-        KeyPair.create(
-            name=NAME_1, public_key="", private_key="", password=None
-        )
-        KeyPair.create(name=NAME_2, public_key="", private_key="", password=pw)
-
-        # Create archive metadata using each of the key pairs
-        Archive.create(
-            name=NAME_1,
-            src_path="src",
-            dst_path="dst",
-            key_pair=KeyPair.select()
-            .where(KeyPair.name == NAME_1)
-            .execute()[0],
-        )
-        Archive.create(
-            name=NAME_2,
-            src_path="src",
-            dst_path="dst",
-            key_pair=KeyPair.select()
-            .where(KeyPair.name == NAME_1)
-            .execute()[0],
-        )
+        # Insert the test data in a single transaction
+        with DB.atomic():
+
+            # Create a key pair, one with a password and one without
+            key_pair = KeyPair.create(
+                name=NAME_1, public_key="", private_key="", password=None
+            )
+            KeyPair.create(
+                name=NAME_2, public_key="", private_key="", password=pw
+            )
+
+            # Create archive metadata using the first key pair
+            Archive.create(
+                name=NAME_1, src_path="src", dst_path="dst", key_pair=key_pair
+            )
+            Archive.create(
+                name=NAME_2, src_path="src", dst_path="dst", key_pair=key_pair
+            )
 
         # Make a file and a directory used for testing
-        try:
-            os.mkdir(TEST_PATH_DST)
-            if not os.path.exists(SRC_FILE):
-                with open(SRC_FILE, "w+") as f:
-                    f.write("TESTING")
-        except FileExistsError as e:
-            print(f"File Exists : {e}")
+        os.makedirs(TEST_PATH_DST, exist_ok=True)
+        with open(SRC_FILE, "w") as f:
+            f.write("TESTING")
 
     @classmethod
     def tearDownClass(cls):
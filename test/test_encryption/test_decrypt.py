@@ -0,0 +1,42 @@
+"""Test functions related to decryption."""
+
+import os
+from base64 import urlsafe_b64encode
+from io import BytesIO
+from unittest import TestCase
+
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet
+
+from config import CHUNK_SIZE
+from encryption.decrypt import decrypt_stream
+from encryption.encrypt import encrypt_stream
+from encryption.keys import generate_symmetric_key
+
+
+class TestDecrypt(TestCase):
+    """Test the streaming functions in encryption.decrypt."""
+
+    def test_stream(self):
+        """Ensure streamed archives round trip and legacy archives decrypt."""
+        key = generate_symmetric_key()
+        data = os.urandom(CHUNK_SIZE * 2 + 7)
+
+        # Ensure a streamed archive can be decrypted
+        encrypted = BytesIO()
+        encrypt_stream(BytesIO(data), encrypted, key)
+        result = BytesIO()
+        decrypt_stream(BytesIO(encrypted.getvalue()), result, key)
+        self.assertEqual(result.getvalue(), data)
+
+        # Ensure a legacy archive created by Fernet can be decrypted
+        result = BytesIO()
+        token = Fernet(urlsafe_b64encode(key)).encrypt(data)
+        decrypt_stream(BytesIO(token), result, key)
+        self.assertEqual(result.getvalue(), data)
+
+        # Ensure a tampered archive is rejected
+        tampered = bytearray(encrypted.getvalue())
+        tampered[100] ^= 1
+        with self.assertRaises(InvalidTag):
+            decrypt_stream(BytesIO(bytes(tampered)), BytesIO(), key)
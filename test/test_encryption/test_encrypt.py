@@ -1,10 +1,15 @@
 """Test functions related to encryption."""
 
 import os
+from unittest.mock import patch
 
 from config import DB_PATH
 from encryption.decrypt import decrypt_archive, db_restore_wrapper
-from encryption.encrypt import db_backup_wrapper, encrypt_wrapper
+from encryption.encrypt import (
+    check_aes_ni,
+    db_backup_wrapper,
+    encrypt_wrapper,
+)
 from encryption.keys import generate_asymmetric_key_pair
 from test.setup_tests import SRC_FILE, TestSetup, TEST_PATH_DST
 from utils.helpers import cleanup
@@ -13,6 +18,15 @@ from utils.helpers import cleanup
 class TestEncrypt(TestSetup):
     """Tests the functionality in the encryption package."""
 
+    def test_check_aes_ni(self):
+        """Ensure AES-NI is only reported as disabled when it is masked."""
+        env = {"OPENSSL_ia32cap": "~0x200000200000000"}
+        with patch.dict(os.environ, env):
+            self.assertEqual(check_aes_ni().success, False)
+        env = {"OPENSSL_ia32cap": "~0x0"}
+        with patch.dict(os.environ, env):
+            self.assertEqual(check_aes_ni().success, True)
+
     def test_encryption(self):
         """Ensure encryption, decryption, DB backups, and DB restores work."""
 
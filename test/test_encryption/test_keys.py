@@ -2,10 +2,16 @@
 
 import os
 
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
+
 from db import KeyPair
 from encryption.keys import (
     generate_asymmetric_key_pair,
     import_key_pair,
+    load_private_key,
+    load_public_key,
     write_all_key_pairs,
 )
 from test.setup_tests import TestSetup, TEST_PATH_DST
@@ -22,7 +28,7 @@ class TestKeys(TestSetup):
 
         # Generate a key
         generate_asymmetric_key_pair(NAME)
-        kp = KeyPair.select().where(KeyPair.name == NAME).execute()[0]
+        kp = KeyPair.get(KeyPair.name == NAME)
         self.assertEqual(kp.name, NAME)
         self.assertIsNotNone(kp.private_key)
         self.assertIsNotNone(kp.public_key)
@@ -38,7 +44,38 @@ class TestKeys(TestSetup):
         result_imp = import_key_pair(NEW_NAME, priv_path, pub_path)
         self.assertEqual(result_imp.success, True)
         self.assertEqual(result_imp.msg, "")
-        kp = KeyPair.select().where(KeyPair.name == NEW_NAME).execute()[0]
+        kp = KeyPair.get(KeyPair.name == NEW_NAME)
         self.assertEqual(kp.name, NEW_NAME)
         self.assertIsNotNone(kp.private_key)
         self.assertIsNotNone(kp.public_key)
+
+    def test_load_private_key(self):
+        """Ensure private keys are cached and still require the password."""
+        private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend()
+        )
+        private_bytes = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.BestAvailableEncryption(
+                b"password"
+            ),
+        )
+
+        result = load_private_key(private_bytes, "password")
+        self.assertIs(load_private_key(private_bytes, "password"), result)
+        with self.assertRaises(ValueError):
+            load_private_key(private_bytes, "wrong")
+
+    def test_load_public_key(self):
+        """Ensure public keys are cached by their bytes."""
+        private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048, backend=default_backend()
+        )
+        public_bytes = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+        result = load_public_key(public_bytes)
+        self.assertIs(load_public_key(bytes(public_bytes)), result)
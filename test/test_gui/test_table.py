@@ -0,0 +1,63 @@
+"""Test GUI table functions and classes."""
+
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+from unittest import TestCase
+
+from config import DB, TABLE_PAGE_SIZE
+from db import Archive, db_checkpoint, init_db, KeyPair
+from gui.table import ArchiveRecycleView
+
+
+class TestTable(TestCase):
+    """Test classes in gui.table."""
+
+    def setUp(self):
+        """Creates a DB file with more archives than fit in a page."""
+        self.db_dir = mkdtemp()
+        init_db(os.path.join(self.db_dir, "TEST.db"))
+
+        with DB.atomic():
+            key_pair = KeyPair.create(name="", public_key="", private_key="")
+            for i in range(TABLE_PAGE_SIZE * 2):
+                Archive.create(
+                    name=str(i), src_path="", dst_path="", key_pair=key_pair
+                )
+
+    def tearDown(self):
+        """Removes the DB file."""
+        DB.close()
+        rmtree(self.db_dir)
+
+    @staticmethod
+    def checkpoint():
+        """Checkpoints the DB from another connection, as a backup does.
+
+        Returns:
+            bool: True if the checkpoint was not blocked by a reader.
+        """
+        result = []
+
+        def run():
+            result.append(db_checkpoint())
+            DB.close()
+
+        thread = Thread(target=run)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_stop_loading(self):
+        """Ensure stop_loading cancels loading and releases the cursor."""
+        table = ArchiveRecycleView()
+        self.assertTrue(table.load_page(0))
+        self.assertEqual(len(table.data), TABLE_PAGE_SIZE)
+        self.assertFalse(self.checkpoint())
+
+        table.stop_loading()
+        self.assertFalse(table.load_event.is_triggered)
+        self.assertFalse(table.load_page(0))
+        self.assertEqual(len(table.data), TABLE_PAGE_SIZE)
+        self.assertTrue(self.checkpoint())
@@ -3,8 +3,18 @@
 import os
 from shutil import rmtree
 from unittest import TestCase
+from unittest.mock import patch
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-from utils.archive import extract_files, zip_dir, zip_files
+from config import PARALLEL_MIN_FILES
+from utils import archive
+from utils.archive import (
+    add_dir,
+    compress_type,
+    extract_files,
+    zip_dir,
+    zip_files,
+)
 
 
 TEST_DIR_SRC = "TEST_ARCH_SRC"
@@ -40,6 +50,32 @@ class TestArchive(TestCase):
         rmtree(TEST_PATH_DST)
         rmtree(TEST_PATH_SRC)
 
+    def test_add_dir(self):
+        """Ensure add_dir compresses many files in parallel correctly."""
+        src = os.path.join(TEST_PATH_SRC, "PARALLEL")
+        os.mkdir(src)
+        for i in range(PARALLEL_MIN_FILES):
+            with open(os.path.join(src, f"{i}.txt"), "w+") as f:
+                f.write(TEST_MSG * i)
+        with open(os.path.join(src, "TEST.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+
+        # Python versions that cannot write compressed files directly fall
+        # back to writing the files one at a time
+        path = os.path.join(TEST_PATH_DST, "TEST_PARALLEL.zip")
+        for raw_write in (archive._RAW_WRITE, False):
+            with patch("utils.archive._RAW_WRITE", raw_write):
+                with ZipFile(path, "w", ZIP_DEFLATED) as zip_file:
+                    add_dir(zip_file, src)
+
+            with ZipFile(path, "r") as zip_file:
+                self.assertIsNone(zip_file.testzip())
+                text = zip_file.read("PARALLEL/3.txt").decode()
+                png = zip_file.getinfo("PARALLEL/TEST.png")
+            self.assertEqual(text, TEST_MSG * 3)
+            self.assertEqual(png.compress_type, ZIP_STORED)
+        rmtree(src)
+
     def test_zip_dir(self):
         """Ensure zip_dir creates a valid archive."""
         zip_dir(ZIP_DIR, TEST_PATH_SRC, TEST_PATH_DST)
@@ -64,3 +100,39 @@ class TestArchive(TestCase):
         with open(result, "r") as f:
             text = f.read()
         self.assertEqual(text, TEST_MSG)
+
+    def test_extract_files_paths(self):
+        """Ensure extract_files keeps every member within the destination."""
+        path = os.path.join(TEST_PATH_DST, "TEST_PATHS.zip")
+        with ZipFile(path, "w") as zip_file:
+            zip_file.writestr("../../ESCAPE.txt", TEST_MSG)
+            zip_file.writestr("/ABSOLUTE.txt", TEST_MSG)
+            zip_file.writestr("SUB/./NESTED.txt", TEST_MSG)
+
+        dst = os.path.join(TEST_PATH_DST, "PATHS")
+        extract_files(path, dst)
+        result = sorted(
+            os.path.relpath(os.path.join(root, file), dst)
+            for root, _, files in os.walk(dst)
+            for file in files
+        )
+        expected = [
+            "ABSOLUTE.txt",
+            "ESCAPE.txt",
+            os.path.join("SUB", "NESTED.txt"),
+        ]
+        self.assertEqual(result, expected)
+
+    def test_compress_type(self):
+        """Ensure compress_type only stores already compressed files."""
+        png = os.path.join(TEST_PATH_SRC, "TEST.png")
+        with open(png, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+
+        path = os.path.join(TEST_PATH_DST, "TEST_TYPE.zip")
+        with ZipFile(path, "w", ZIP_DEFLATED) as zip_file:
+            result_png = compress_type(zip_file, png)
+            result_txt = compress_type(zip_file, TEST_PATH_FILE)
+        self.assertEqual(result_png, ZIP_STORED)
+        self.assertEqual(result_txt, ZIP_DEFLATED)
+        os.remove(png)
@@ -3,11 +3,12 @@
 import os
 
 from config import TMP_DIR
-from test.setup_tests import TestSetup, TEST_PATH_DST
+from test.setup_tests import NAME_2, TestSetup, TEST_PATH_DST
 from utils.helpers import (
     cleanup,
     get_archives,
     get_key_names,
+    get_key_pair,
     get_key_pairs,
     get_table_width,
 )
@@ -25,7 +26,7 @@ class TestHelpers(TestSetup):
 
     def test_get_archives(self):
         """Ensure get_archives returns the expected data."""
-        result = get_archives()
+        result = list(get_archives())
         self.assertEqual(len(result), 2)
 
     def test_get_key_names(self):
@@ -33,6 +34,13 @@ class TestHelpers(TestSetup):
         result = get_key_names()
         self.assertEqual(len(result), 2)
 
+    def test_get_key_pair(self):
+        """Ensure get_key_pair returns the expected data."""
+        result = get_key_pair(NAME_2)
+        self.assertEqual(result.name, NAME_2)
+        self.assertIsNotNone(result.id)
+        self.assertIs(get_key_pair(NAME_2), result)
+
     def test_get_table_width(self):
         """Ensure get_table_width returns a valid integer greater than 0."""
         result_keys = get_table_width(get_key_pairs())
@@ -42,6 +50,6 @@ class TestHelpers(TestSetup):
 
     def test_validate_required(self):
         """Ensure get_key_pairs returns the expected data."""
-        result = get_key_pairs()
+        result = list(get_key_pairs())
         self.assertEqual(len(result), 2)
         self.assertEqual(len(result[0]), 5)
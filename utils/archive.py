@@ -1,64 +1,359 @@
 """
-Functions to create and extract zip file archives. Note that the output file
-archive is zipped using ZIP_DEFLATED with the maximum compression level of 9.
+Functions to create and extract zip file archives. Note that output archives
+are zipped using ZIP_DEFLATED at COMPRESS_LEVEL unless told otherwise, since
+higher levels cost far more CPU time for little reduction in size.
 """
 
 import os
-from zipfile import ZipFile, ZIP_DEFLATED
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from shutil import copyfileobj
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+from config import (
+    CHUNK_SIZE,
+    COMPRESS_LEVEL,
+    COMPRESSED_MAGIC,
+    PARALLEL_MAX_SIZE,
+    PARALLEL_MIN_FILES,
+)
+
+#: ZipFile has no public way to write data that is already compressed, so
+#: _write_deflated uses its private attributes. It is only used on the Python
+#: versions it has been tested against, others write files one at a time.
+_RAW_WRITE = (3, 7) <= sys.version_info[:2] <= (3, 13)
+
+#: The level zlib deflates at when no level is given (Z_DEFAULT_COMPRESSION)
+_DEFAULT_LEVEL = 6
+
+
+def add_dir(zip_file, source):
+    """Writes the contents of a directory recursively to an open archive.
+
+    Files that are already compressed are stored without compression.
+
+    Args:
+        zip_file (ZipFile): The archive opened for writing.
+        source (str): The location of the directory to be zipped.
+    """
+    parent = os.path.dirname(source)
+    paths = []
+
+    # Set the real file path and the relative path for the archive
+    for path, _, files in os.walk(source):
+        for file in files:
+            real_path = os.path.join(path, file)
+            paths.append((real_path, real_path[len(parent) :]))
+
+    _write_files(zip_file, paths)
+
+
+def add_files(zip_file, sources):
+    """Writes a list of files to an open archive.
+
+    Files that are already compressed are stored without compression.
+
+    Args:
+        zip_file (ZipFile): The archive opened for writing.
+        sources (list[str]): The location of the files to be zipped.
+    """
+    paths = []
+    for source in sources:
+        parent = os.path.dirname(source)
+        paths.append((source, source[len(parent) :]))
+
+    _write_files(zip_file, paths)
+
+
+def compress_type(zip_file, path):
+    """Determines how a file should be compressed based on its magic number.
+
+    Compressing data that is already compressed (images, video, archives,
+    etc.) costs CPU time and does not reduce its size.
+
+    Args:
+        zip_file (ZipFile): The archive the file will be written to.
+        path (str): The path to the file.
+
+    Returns:
+        int: ZIP_STORED if the file is already compressed, otherwise the
+        archive's compression.
+    """
+    if zip_file.compression == ZIP_STORED:
+        return ZIP_STORED
+
+    with open(path, "rb") as file:
+        header = file.read(16)
+
+    return ZIP_STORED if _is_compressed(header) else zip_file.compression
+
+
+def _is_compressed(header):
+    """Checks if a file's leading bytes belong to a compressed file format.
+
+    Args:
+        header (bytes): At least the first 16 bytes of the file, if it has
+            that many.
+
+    Returns:
+        bool: True if the file is already compressed, False otherwise.
+    """
+
+    # Check the signatures of formats that are detected by a fixed prefix,
+    # then the container formats whose signatures are offset
+    if header.startswith(COMPRESSED_MAGIC):
+        return True
+    elif header[4:8] == b"ftyp":
+        return True
+    elif header.startswith(b"RIFF") and header[8:12] in (b"WEBP", b"AVI "):
+        return True
+
+    return False
+
+
+def _deflate(path, level):
+    """Compresses a file in memory the same way as ZIP_DEFLATED members.
+
+    Args:
+        path (str): The path to the file.
+        level (Optional[int]): The zlib compression level, None for default.
+
+    Returns:
+        Optional[tuple]: The file size, CRC-32, and compressed data. None if
+        the file is too large to be held in memory or is already compressed.
+    """
+    if os.path.getsize(path) > PARALLEL_MAX_SIZE:
+        return None
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if _is_compressed(data[:16]):
+        return None
+
+    if level is None:
+        level = zlib.Z_DEFAULT_COMPRESSION
+
+    # Archives hold raw deflate streams without the zlib header or trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+
+    return len(data), zlib.crc32(data), compressed
+
+
+def _write_deflated(zip_file, real_path, rel_path, future):
+    """Writes a file compressed by _deflate to an open archive.
+
+    Files that _deflate skipped are written by the archive as usual. This
+    relies on private ZipFile attributes, see _RAW_WRITE.
+
+    Args:
+        zip_file (ZipFile): The archive opened for writing.
+        real_path (str): The path to the file.
+        rel_path (str): The path of the file within the archive.
+        future (Future): The pending result of _deflate for the file.
+    """
+    result = future.result()
+    if result is None:
+        compression = compress_type(zip_file, real_path)
+        _write_file(zip_file, real_path, rel_path, compression)
+        return
+
+    zinfo = ZipInfo.from_file(real_path, rel_path)
+    zinfo.compress_type = ZIP_DEFLATED
+    zinfo.file_size, zinfo.CRC, compressed = result
+    zinfo.compress_size = len(compressed)
+
+    # ZipFile cannot write data that is already compressed, so write the
+    # member the same way ZipFile.open does with the sizes known up front
+    with zip_file._lock:
+        if zip_file._seekable:
+            zip_file.fp.seek(zip_file.start_dir)
+        zinfo.header_offset = zip_file.fp.tell()
+        zip_file._writecheck(zinfo)
+        zip_file._didModify = True
+
+        zip_file.fp.write(zinfo.FileHeader())
+        zip_file.fp.write(compressed)
+        zip_file.filelist.append(zinfo)
+        zip_file.NameToInfo[zinfo.filename] = zinfo
+        zip_file.start_dir = zip_file.fp.tell()
+
+
+def _write_file(zip_file, path, arcname, compression):
+    """Writes a file to an open archive in large pieces.
+
+    ZipFile.write copies files 8 KiB at a time, which makes the Python level
+    loop rather than the disk the bottleneck for large files. ZipInfo only has
+    a public compression level from Python 3.13, so before then compressed
+    files with a level set by the archive are still written by ZipFile.write,
+    unless it is the level that zlib uses by default.
+
+    Args:
+        zip_file (ZipFile): The archive opened for writing.
+        path (str): The path to the file.
+        arcname (str): The path of the file within the archive.
+        compression (int): The zipfile compression of the file.
+    """
+    zinfo = ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = compression
+
+    # Deflated members that are not given a level already use zlib's default
+    level = zip_file.compresslevel
+    if compression == ZIP_DEFLATED and level in (
+        zlib.Z_DEFAULT_COMPRESSION,
+        _DEFAULT_LEVEL,
+    ):
+        level = None
+
+    if compression != ZIP_STORED and level is not None:
+        if not hasattr(zinfo, "compress_level"):
+            zip_file.write(path, arcname, compression, level)
+            return
+        zinfo.compress_level = level
+
+    with open(path, "rb") as src, zip_file.open(zinfo, "w") as dst:
+        copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _write_files(zip_file, paths):
+    """Writes files to an open archive, compressing them in parallel.
+
+    When there are many files they are deflated in parallel by a pool of
+    threads, as zlib releases the GIL while compressing. The files are still
+    written to the archive in order by the calling thread.
+
+    Args:
+        zip_file (ZipFile): The archive opened for writing.
+        paths (list[tuple[str, str]]): The path to each file and its path
+            within the archive.
+    """
+
+    # Write the files one at a time if a pool of threads is not worthwhile or
+    # compressed files cannot be written on this version of Python
+    if (
+        not _RAW_WRITE
+        or zip_file.compression != ZIP_DEFLATED
+        or len(paths) < PARALLEL_MIN_FILES
+    ):
+        for real_path, rel_path in paths:
+            compression = compress_type(zip_file, real_path)
+            _write_file(zip_file, real_path, rel_path, compression)
+        return
+
+    # Write the files in order as they are compressed, keeping only a couple
+    # of compressed files per thread in memory
+    workers = os.cpu_count() or 1
+    pending = deque()
+    with ThreadPoolExecutor(workers) as executor:
+        for real_path, rel_path in paths:
+            future = executor.submit(
+                _deflate, real_path, zip_file.compresslevel
+            )
+            pending.append((real_path, rel_path, future))
+            if len(pending) > workers * 2:
+                _write_deflated(zip_file, *pending.popleft())
+
+        while pending:
+            _write_deflated(zip_file, *pending.popleft())
 
 
 def extract_files(source, destination):
     """Extracts a zip archive to the desired output directory.
 
+    Members are copied in CHUNK_SIZE pieces rather than the small buffer used
+    by ZipFile.extractall. Their paths are cleaned the same way so that no
+    member is written outside of the destination.
+
     Args:
         source (str): The zip archive to be extracted.
         destination (str): The destination for the extracted files.
     """
-    with ZipFile(source, "r", ZIP_DEFLATED, compresslevel=9) as zip_file:
-        zip_file.extractall(destination)
+    with ZipFile(source, "r") as zip_file:
+        for info in zip_file.infolist():
+            target = _member_path(destination, info.filename)
+            if target is None:
+                continue
+
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zip_file.open(info) as src, open(target, "wb") as dst:
+                copyfileobj(src, dst, CHUNK_SIZE)
 
 
-def zip_dir(name, source, destination):
+def _member_path(destination, filename):
+    """Builds the path an archive member is extracted to.
+
+    Drive letters, empty parts, and "." and ".." are dropped from the member's
+    name, as ZipFile.extractall does.
+
+    Args:
+        destination (str): The destination for the extracted files.
+        filename (str): The name of the member within the archive.
+
+    Returns:
+        Optional[str]: The path to extract the member to, None if nothing is
+        left of its name.
+    """
+    name = filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+
+    invalid = ("", os.path.curdir, os.path.pardir)
+    parts = [part for part in name.split(os.path.sep) if part not in invalid]
+    if not parts:
+        return None
+
+    return os.path.join(destination, *parts)
+
+
+def zip_dir(name, source, destination, compression=ZIP_DEFLATED):
     """Zips the contents of a directory recursively.
 
     Args:
         name (str): The name of the archive to be created.
         source (str): The location of the directory to be zipped.
         destination (str): Where the resulting zip archive will be stored.
+        compression (Optional[int]): The zipfile compression of the archive,
+            ZIP_STORED for data that will not compress such as ciphertext.
 
     Returns:
         str: The path to the output archive.
     """
     archive_path = os.path.join(destination, name)
 
-    with ZipFile(archive_path, "x", ZIP_DEFLATED, compresslevel=9) as zip_file:
-        for path, _, files in os.walk(source):
-            for file in files:
-                # Set the real file path and the relative path for the archive
-                real_path = os.path.join(path, file)
-                rel_path = real_path.replace(os.path.dirname(source), "")
-
-                # Write the file to the zip archive
-                zip_file.write(real_path, rel_path)
+    with ZipFile(
+        archive_path, "x", compression, compresslevel=COMPRESS_LEVEL
+    ) as zip_file:
+        add_dir(zip_file, source)
 
     return archive_path
 
 
-def zip_files(name, sources, destination):
+def zip_files(name, sources, destination, compression=ZIP_DEFLATED):
     """Zips a list of files.
-    
+
     Args:
         name (str): The name of the archive to be created.
         sources (list[str]): The location of the files to be zipped.
         destination (str): Where the resulting zip archive will be stored.
-        
+        compression (Optional[int]): The zipfile compression of the archive,
+            ZIP_STORED for data that will not compress such as ciphertext.
+
     Returns:
         str: The path to the output archive.
     """
     archive_path = os.path.join(destination, name)
 
-    with ZipFile(archive_path, "x", ZIP_DEFLATED, compresslevel=9) as zip_file:
-        for source in sources:
-            zip_file.write(source, source.replace(os.path.dirname(source), ""))
+    with ZipFile(
+        archive_path, "x", compression, compresslevel=COMPRESS_LEVEL
+    ) as zip_file:
+        add_files(zip_file, sources)
 
     return archive_path
@@ -1,19 +1,33 @@
 """General helper functions."""
 
 import os
+import sys
 from collections import namedtuple
+from functools import lru_cache
 from shutil import rmtree
 
-from peewee import DoesNotExist
-from kivy.utils import platform
+from peewee import Case, DoesNotExist, fn, JOIN
 
 from config import TABLE_SIZE_FACTOR, TABLE_SIZE_FACTOR_MOBILE, TMP_DIR
-from db import Archive, KeyPair
-
+from db import Archive, KeyPair, Password
 
 #: Named tuple used to propagate results from function calls
 Result = namedtuple("Result", ["success", "msg"])
 
+#: Named tuple holding a key pair and its password metadata
+KeyPairInfo = namedtuple(
+    "KeyPairInfo",
+    [
+        "id",
+        "name",
+        "public_key",
+        "private_key",
+        "password_id",
+        "password_strong",
+        "password_hint",
+    ],
+)
+
 
 def cleanup(destination):
     """Remove a temporary directory and any files in it.
@@ -21,46 +35,89 @@ def cleanup(destination):
     Args:
         destination (str): The path where the temporary directory was created.
     """
-    tmp_dir = os.path.join(destination, TMP_DIR)
-    if os.path.exists(tmp_dir):
-        rmtree(tmp_dir)
+    # Removing the directory directly saves a stat when it exists, which is
+    # the usual case
+    try:
+        rmtree(os.path.join(destination, TMP_DIR))
+    except FileNotFoundError:
+        pass
 
 
-def get_key_pairs():
-    """Fetch all key pairs from the database.
+@lru_cache(maxsize=64)
+def get_key_pair(name):
+    """Fetch a single key pair and its password metadata from the database.
+
+    Results are cached, so get_key_pair.cache_clear() must be called whenever
+    key pairs are added or the database is replaced.
+
+    Args:
+        name (str): The unique name of the key pair.
 
     Returns:
-        list[dict[str, str]]: All key pairs as a list of strings.
+        KeyPairInfo: The key pair's data.
+
+    Raises:
+        DoesNotExist: There is no key pair with the given name.
     """
+    row = (
+        KeyPair.select(
+            KeyPair.id,
+            KeyPair.name,
+            KeyPair.public_key,
+            KeyPair.private_key,
+            KeyPair.password,
+            Password.strong,
+            Password.hint,
+        )
+        .join(Password, JOIN.LEFT_OUTER)
+        .where(KeyPair.name == name)
+        .dicts()
+        .get()
+    )
+    return KeyPairInfo(
+        row["id"],
+        row["name"],
+        row["public_key"],
+        row["private_key"],
+        row["password"],
+        row["strong"],
+        row["hint"],
+    )
 
-    results = []
-    key_pairs = KeyPair.select().order_by(KeyPair.timestamp.desc())
-
-    for key_pair in key_pairs:
-
-        # Set defaults for key pairs as they may not have a password
-        name = key_pair.name
-        password = "False"
-        hint = ""
-        strong = ""
-
-        # Set password parameters if present
-        if key_pair.password:
-            password = "True"
-            hint = key_pair.password.hint
-            strong = str(key_pair.password.strong)
-
-        results.append(
-            {
-                "name": name,
-                "pw": password,
-                "hint": hint,
-                "strong": strong,
-                "timestamp": str(key_pair.timestamp),
-            }
+
+def get_key_pairs():
+    """Fetch all key pairs from the database.
+
+    Rows are read from the database as they are consumed and are not cached
+    by peewee. The password metadata is joined in the same query rather than
+    fetched once per row, and is converted to its displayed strings by SQLite.
+    Timestamps are read as the text they are stored as rather than being
+    parsed into datetimes.
+
+    Yields:
+        dict[str, str]: Each key pair as strings.
+    """
+    # Key pairs without a password have no joined row, so they are shown
+    # with no hint or strength
+    has_pw = Case(None, [(KeyPair.password.is_null(), "False")], "True")
+    hint = fn.COALESCE(Password.hint, "")
+    strong = Case(Password.strong, [(True, "True"), (False, "False")], "")
+
+    key_pairs = (
+        KeyPair.select(
+            KeyPair.name,
+            has_pw.alias("pw"),
+            hint.alias("hint"),
+            strong.alias("strong"),
+            KeyPair.timestamp.cast("TEXT").alias("timestamp"),
         )
+        .join(Password, JOIN.LEFT_OUTER)
+        .order_by(KeyPair.timestamp.desc())
+        .dicts()
+        .iterator()
+    )
 
-    return results
+    yield from key_pairs
 
 
 def get_key_names():
@@ -69,57 +126,42 @@ def get_key_names():
     Returns:
         list[str]: The names of all key pairs.
     """
-    key_pairs = KeyPair.select().order_by(KeyPair.timestamp.desc())
-    return [key_pair.name for key_pair in key_pairs]
+    key_pairs = (
+        KeyPair.select(KeyPair.name)
+        .order_by(KeyPair.timestamp.desc())
+        .tuples()
+        .iterator()
+    )
+    return [name for (name,) in key_pairs]
 
 
-def gui_thread(gui, func, err_msg, clean, **kwargs):
+def gui_thread(func, err_msg, **kwargs):
     """Run as a thread to execute another function asynchronously.
 
+    Widgets must only be changed on the GUI thread, so any message for the
+    end user is returned rather than shown from here.
+
     Args:
-        gui (RunGUI): The GUI for the application.
         func (function): The function to be executed.
         err_msg (str): An error message in case on any exceptions.
-        clean (str): A temporary data location that needs to be removed.
-        kwargs (str): All of the functions arguments as keyword arguments.
-    """
-
-    # Convert the keyword arguments to standard positional arguments
-    args = tuple(kwargs.values())
+        kwargs (str): All of the functions arguments as keyword arguments, in
+            the order of its parameters. Their names label the GUI's fields
+            and need not match the function's parameter names.
 
+    Returns:
+        Result: Details of the function's results, the message is an error if
+        it failed or a warning if it succeeded.
+    """
     try:
-        # Run the function with the provided args
-        result = func(*args)
-
-        # Update the GUI's combo boxes as new key pairs may have been added
-        gui.update_drop_downs()
-
-        # Check if a message needs to be shown to the end user
-        if not result.success:
-            gui.launch_popup("Error", f"{result.msg}", error=True)
-            gui.popup_msg.dismiss()
-        elif result.msg:
-            gui.launch_popup("Warning", result.msg, error=True)
-            gui.popup_msg.dismiss()
-
-        # Cleanup temporary storage if needed
-        if clean:
-            cleanup(clean)
+        # Keyword arguments keep the order they were passed in, so their
+        # values are passed straight through as positional arguments
+        return func(*kwargs.values())
 
     except DoesNotExist:
         name = kwargs["key_pair_name"]
-        gui.launch_popup(
-            "Error", f'Key pair with name "{name}" does not exist', error=True
-        )
-        gui.popup_msg.dismiss()
+        return Result(False, f'Key pair with name "{name}" does not exist')
     except Exception as e:
-        gui.launch_popup("Error", f"{err_msg} -- {e}", error=True)
-        gui.popup_msg.dismiss()
-        if clean:
-            cleanup(clean)
-
-    # Re-enable submit buttons in the GUI upon function execution completion
-    gui.enable_submits()
+        return Result(False, f"{err_msg} -- {e}")
 
 
 def get_table_width(data):
@@ -134,38 +176,61 @@ def get_table_width(data):
     Returns:
         int: The width of the table.
     """
-    maximum = 0
-    for row in data:
-        length = 0
-        for _, val in row.items():
-            length += len(val)
-        maximum = length if length > maximum else maximum
-
-    # Set the width based on the target platform
+    maximum = max((sum(map(len, row.values())) for row in data), default=0)
+
+    return maximum * _table_size_factor()
+
+
+@lru_cache(maxsize=None)
+def _table_size_factor():
+    """Determine the table size factor for the target platform.
+
+    The platform never changes while running, so it is only checked once.
+
+    Returns:
+        int: The size factor for GUI tables.
+    """
+    # Only the GUI needs Kivy, so the CLI does not pay for importing it
+    from kivy.utils import platform
+
     if platform == "android":
-        return maximum * TABLE_SIZE_FACTOR_MOBILE
+        return TABLE_SIZE_FACTOR_MOBILE
     else:
-        return maximum * TABLE_SIZE_FACTOR
+        return TABLE_SIZE_FACTOR
 
 
 def get_archives():
     """Fetch all archives from the database.
 
-    Returns:
-        list[dict[str, str]]: All key pairs as a list of strings.
-    """
-    archives = Archive.select().order_by(Archive.timestamp.desc())
-    data = []
+    Rows are read from the database as they are consumed and are not cached
+    by peewee. The key pair names are joined in the same query rather than
+    fetched once per row. Paths and key pair names repeat across many
+    archives, so they are interned to share a single string between the rows.
+    Timestamps are read as the text they are stored as rather than being
+    parsed into datetimes.
 
-    for archive in archives:
-        data.append(
-            {
-                "name": archive.name,
-                "src_path": archive.src_path,
-                "dst_path": archive.dst_path,
-                "kp": archive.key_pair.name,
-                "timestamp": str(archive.timestamp),
-            }
+    Yields:
+        dict[str, str]: Each archive as strings.
+    """
+    archives = (
+        Archive.select(
+            Archive.name,
+            Archive.src_path,
+            Archive.dst_path,
+            KeyPair.name.alias("kp"),
+            Archive.timestamp.cast("TEXT").alias("timestamp"),
         )
+        .join(KeyPair)
+        .order_by(Archive.timestamp.desc())
+        .dicts()
+        .iterator()
+    )
 
-    return data
+    for archive in archives:
+        yield {
+            "name": archive["name"],
+            "src_path": sys.intern(archive["src_path"]),
+            "dst_path": sys.intern(archive["dst_path"]),
+            "kp": sys.intern(archive["kp"]),
+            "timestamp": archive["timestamp"],
+        }
@@ -1,10 +1,16 @@
 """Functions to validate user input."""
 
-import re
+from string import ascii_lowercase, ascii_uppercase, digits
 
 from config import PW_MSG, SPECIAL_CHARS
 from utils.helpers import Result
 
+# Character classes counted by the password strength criteria
+_LOWER = frozenset(ascii_lowercase)
+_UPPER = frozenset(ascii_uppercase)
+_DIGITS = frozenset(digits)
+_SPECIAL = frozenset(SPECIAL_CHARS)
+
 
 def strong_password(pw):
     """Determine the strength of a password based on a fixed criteria.
@@ -15,38 +21,37 @@ def strong_password(pw):
     Returns:
         Result: Summary of whether or not the password is strong.
     """
-    special = SPECIAL_CHARS
-    success = True
-    msg = ""
-
-    # Perform regex operations that evaluate password strength criteria
-    match_alpha_lower = re.findall("[a-z]", pw)
-    match_alpha_upper = re.findall("[A-Z]", pw)
-    match_digits = re.findall("[0-9]", pw)
-    match_special = re.findall(f"[{special}]", pw)
-
-    # Validates each portion of the password strength criteria
+    # Check the length before scanning the characters of the password
     if len(pw) < 8:
-        msg = PW_MSG["fail"]
-        success = False
-        print(msg)
+        return Result(False, PW_MSG["fail"])
     elif len(pw) < 20:
-        msg = PW_MSG["short"]
-        print(msg)
-    elif len(match_alpha_lower) < 2:
+        return Result(True, PW_MSG["short"])
+
+    msg = ""
+
+    # Count each class of character in a single pass over the password
+    count_lower = count_upper = count_digits = count_special = 0
+    for char in pw:
+        if char in _LOWER:
+            count_lower += 1
+        elif char in _UPPER:
+            count_upper += 1
+        elif char in _DIGITS:
+            count_digits += 1
+        elif char in _SPECIAL:
+            count_special += 1
+
+    # Validates the remaining portions of the password strength criteria
+    if count_lower < 2:
         msg = PW_MSG["lower"]
-        print(msg)
-    elif len(match_alpha_upper) < 2:
+    elif count_upper < 2:
         msg = PW_MSG["upper"]
-        print(msg)
-    elif len(match_digits) < 2:
+    elif count_digits < 2:
         msg = PW_MSG["digits"]
-        print(msg)
-    elif len(match_special) < 2:
+    elif count_special < 2:
         msg = PW_MSG["special"]
-        print(msg)
 
-    return Result(success, msg)
+    return Result(True, msg)
 
 
 def validate_required(**kwargs):
@@ -58,17 +63,12 @@ def validate_required(**kwargs):
     Returns:
         Result: This object's success attribute is True if all args have value.
     """
-    result = True
-    msg = "These parameters are required -- "
-
-    for kwarg in kwargs:
-        # Build an error message based on the required arguments
-        msg = f'{msg}"{str(kwarg).title().replace("_", " ")}", '
-
-        # Test the argument using its "truthiness"
-        result = result and kwargs[kwarg]
-
-    if result:
-        return Result(result, "")
-
-    return Result(result, msg[:-2])
+    # Test the arguments using their "truthiness"
+    if all(kwargs.values()):
+        return Result(True, "")
+
+    # Build an error message based on the required arguments
+    names = ", ".join(
+        f'"{str(kwarg).title().replace("_", " ")}"' for kwarg in kwargs
+    )
+    return Result(False, f"These parameters are required -- {names}")